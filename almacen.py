@@ -0,0 +1,216 @@
+"""
+Este módulo carga todos los conjuntos de datos en una base de datos SQLite local.
+
+Cada conjunto de datos se guarda en una tabla con su mismo nombre y con
+dos índices: uno que inicia con el periodo y otro que inicia con las
+llaves de la serie. El primero acelera las consultas de un año o rango
+de años y el segundo las consultas de una serie (una entidad, un país,
+un flujo) a lo largo del tiempo.
+
+Los periodos se guardan como texto en formato AAAA-MM-DD, por lo que
+los rangos de fechas se resuelven con comparaciones de texto.
+
+La base de datos se genera completa en un archivo temporal que después
+reemplaza al archivo anterior. Las consultas se hacen con consultas.py.
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from datos import cargar
+from esquemas import ESQUEMAS
+from pib import RUTA_PIB
+from poblacion import RUTA_POBLACION, leer_poblacion
+from puntos_control import archivo_temporal
+
+
+# Ruta de la base de datos.
+RUTA_ALMACEN = "./data/remesas.sqlite"
+
+
+def leer_pib():
+    """
+    Lee el PIB estatal del INEGI con el año convertido a fecha.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Un registro por año, entidad e industria.
+
+    """
+
+    df = pd.read_csv(RUTA_PIB)
+
+    df["PERIODO"] = pd.to_datetime(df["PERIODO"].astype(str), format="%Y").astype(
+        "datetime64[ns]"
+    )
+
+    return df
+
+
+# Conjuntos de datos que no son generados por el ETL pero que también
+# se cargan en la base de datos.
+TABLAS_ADICIONALES = {
+    "poblacion": {
+        "ruta": RUTA_POBLACION,
+        "lector": leer_poblacion,
+        "llaves": ["PERIODO", "CVE"],
+    },
+    "pib_estatal": {
+        "ruta": RUTA_PIB,
+        "lector": leer_pib,
+        "llaves": ["PERIODO", "CVE_ENT", "CLAVE_INDUSTRIA"],
+    },
+}
+
+# Todas las tablas de la base de datos con la ruta de su archivo de origen.
+TABLAS = {
+    **{nombre: esquema["ruta"] for nombre, esquema in ESQUEMAS.items()},
+    **{nombre: tabla["ruta"] for nombre, tabla in TABLAS_ADICIONALES.items()},
+}
+
+
+def leer_tabla(nombre):
+    """
+    Lee un conjunto de datos desde su archivo de origen.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de la tabla.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El conjunto de datos completo.
+
+    """
+
+    if nombre in TABLAS_ADICIONALES:
+        return TABLAS_ADICIONALES[nombre]["lector"]()
+
+    return cargar(nombre)
+
+
+def obtener_llaves(nombre):
+    """
+    Regresa las columnas que identifican a cada registro de una tabla.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de la tabla.
+
+    Returns
+    -------
+    list
+        Las llaves, empezando por PERIODO.
+
+    """
+
+    if nombre in TABLAS_ADICIONALES:
+        return TABLAS_ADICIONALES[nombre]["llaves"]
+
+    return ESQUEMAS[nombre]["llaves"]
+
+
+def escribir_tabla(conexion, nombre, df):
+    """
+    Escribe un conjunto de datos en la base de datos y crea sus índices.
+
+    Parameters
+    ----------
+    conexion : sqlite3.Connection
+        La conexión a la base de datos.
+
+    nombre : str
+        El nombre de la tabla.
+
+    df : pandas.DataFrame
+        El conjunto de datos completo.
+
+    """
+
+    df = df.copy()
+    df["PERIODO"] = df["PERIODO"].dt.strftime("%Y-%m-%d")
+
+    df.to_sql(nombre, conexion, index=False)
+
+    llaves = obtener_llaves(nombre)
+    series = [llave for llave in llaves if llave != "PERIODO"]
+
+    conexion.execute(
+        f'CREATE INDEX "{nombre}_periodo" ON "{nombre}" ({", ".join(llaves)})'
+    )
+
+    # Las tablas con una sola serie (IPC, tipo de cambio) solo necesitan un índice.
+    if series:
+        conexion.execute(
+            f'CREATE INDEX "{nombre}_serie" ON "{nombre}" '
+            f'({", ".join(series)}, PERIODO)'
+        )
+
+
+def generar_almacen(ruta=RUTA_ALMACEN):
+    """
+    Genera la base de datos con todos los conjuntos de datos.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta de la base de datos.
+
+    Returns
+    -------
+    int
+        El número total de registros escritos.
+
+    """
+
+    filas = 0
+
+    with archivo_temporal(ruta) as temporal:
+        conexion = sqlite3.connect(temporal)
+
+        try:
+            for nombre in TABLAS:
+                df = leer_tabla(nombre)
+                escribir_tabla(conexion, nombre, df)
+                filas += len(df)
+
+            conexion.commit()
+        finally:
+            conexion.close()
+
+    return filas
+
+
+def almacen_vigente(nombre, ruta=RUTA_ALMACEN):
+    """
+    Indica si la base de datos existe y está al día con el archivo de una tabla.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de la tabla.
+
+    ruta : str
+        La ruta de la base de datos.
+
+    Returns
+    -------
+    bool
+        True si la tabla se puede consultar en la base de datos. Si el
+        archivo de la tabla no existe, la tabla guardada podría ser de un
+        conjunto de datos eliminado o renombrado, por lo que no está al día.
+
+    """
+
+    origen = TABLAS[nombre]
+
+    if not os.path.exists(ruta) or not os.path.exists(origen):
+        return False
+
+    return os.path.getmtime(ruta) >= os.path.getmtime(origen)
@@ -0,0 +1,165 @@
+"""
+Este módulo registra los cambios entre dos versiones de un conjunto de datos.
+
+Banxico revisa las cifras de periodos anteriores en cada publicación.
+Antes de reemplazar un archivo, el ETL compara la nueva versión contra
+la anterior usando las llaves del esquema y agrega las diferencias al
+archivo ./cambios/{nombre}.csv con tres tipos de cambio:
+
+    - agregado: el registro no existía en la versión anterior.
+    - eliminado: el registro ya no existe en la nueva versión.
+    - revisado: alguno de sus valores numéricos cambió.
+
+Cada registro incluye el valor anterior y el nuevo de cada columna
+numérica (por ejemplo VALOR_USD_ANTERIOR y VALOR_USD_NUEVO), de modo que
+se pueden invalidar solo los periodos y las series afectadas.
+"""
+
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from esquemas import ESQUEMAS
+from puntos_control import archivo_temporal
+
+
+# Carpeta donde se guardan los cambios de cada conjunto de datos.
+CARPETA_CAMBIOS = "./cambios"
+
+# Sufijos de las columnas con los valores de cada versión.
+VERSIONES = ["ANTERIOR", "NUEVO"]
+
+# Diferencia relativa a partir de la cual un valor flotante se considera revisado.
+TOLERANCIA = 1e-9
+
+
+def obtener_valores(nombre):
+    """
+    Regresa las columnas numéricas de un conjunto de datos que no son llaves.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    Returns
+    -------
+    list
+        Los nombres de las columnas que se comparan entre versiones.
+
+    """
+
+    esquema = ESQUEMAS[nombre]
+
+    return [
+        columna
+        for columna, tipo in esquema["columnas"].items()
+        if columna not in esquema["llaves"]
+        and pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(tipo))
+    ]
+
+
+def calcular_cambios(anterior, nuevo, nombre):
+    """
+    Compara dos versiones de un conjunto de datos registro por registro.
+
+    Parameters
+    ----------
+    anterior : pandas.DataFrame
+        La versión anterior, con los tipos de su esquema.
+
+    nuevo : pandas.DataFrame
+        La nueva versión, con los tipos de su esquema.
+
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Un registro por cada llave agregada, eliminada o revisada, con
+        el tipo de cambio y los valores anteriores y nuevos.
+
+    """
+
+    llaves = ESQUEMAS[nombre]["llaves"]
+    valores = obtener_valores(nombre)
+
+    df = anterior[llaves + valores].merge(
+        nuevo[llaves + valores],
+        on=llaves,
+        how="outer",
+        suffixes=tuple(f"_{version}" for version in VERSIONES),
+        indicator=True,
+    )
+
+    tipos = ESQUEMAS[nombre]["columnas"]
+    revisados = pd.Series(False, index=df.index)
+
+    for valor in valores:
+        previos, actuales = df[f"{valor}_ANTERIOR"], df[f"{valor}_NUEVO"]
+
+        # Los flotantes pueden diferir en el último dígito al leerse del CSV,
+        # por lo que se comparan con una tolerancia relativa. Los enteros
+        # se comparan exactamente.
+        if pd.api.types.is_float_dtype(pd.api.types.pandas_dtype(tipos[valor])):
+            revisados |= ~np.isclose(previos, actuales, rtol=TOLERANCIA, atol=0)
+        else:
+            revisados |= previos != actuales
+
+    df["CAMBIO"] = df["_merge"].map(
+        {"left_only": "eliminado", "right_only": "agregado", "both": "revisado"}
+    )
+
+    df = df[(df["_merge"] != "both") | revisados]
+
+    columnas = [f"{valor}_{version}" for valor in valores for version in VERSIONES]
+
+    # Los registros agregados o eliminados no tienen uno de los dos valores,
+    # por eso las columnas enteras se convierten a enteros que admiten nulos.
+    df = df.astype(
+        {
+            f"{valor}_{version}": "Int64"
+            for valor in valores
+            for version in VERSIONES
+            if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(tipos[valor]))
+        }
+    )
+
+    return df[llaves + ["CAMBIO"] + columnas].sort_values(llaves, ignore_index=True)
+
+
+def registrar_cambios(cambios, nombre):
+    """
+    Agrega los cambios de una ejecución al historial de un conjunto de datos.
+
+    Parameters
+    ----------
+    cambios : pandas.DataFrame
+        Los cambios generados por calcular_cambios().
+
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    """
+
+    os.makedirs(CARPETA_CAMBIOS, exist_ok=True)
+    ruta = os.path.join(CARPETA_CAMBIOS, f"{nombre}.csv")
+
+    cambios = cambios.copy()
+    ejecucion = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    cambios.insert(0, "EJECUCION", ejecucion)
+
+    # Copiamos el historial al temporal y agregamos los nuevos cambios al final.
+    with archivo_temporal(ruta) as temporal:
+        existe = os.path.exists(ruta)
+
+        if existe:
+            shutil.copyfile(ruta, temporal)
+
+        cambios.to_csv(
+            temporal, mode="a", header=not existe, index=False, encoding="utf-8"
+        )
@@ -0,0 +1,318 @@
+"""
+Catálogos de entidades, países y estados de EE. UU. utilizados
+para asignar claves a los nombres que aparecen en los cuadros de Banxico.
+"""
+
+
+ENTIDADES = {
+    1: "Aguascalientes",
+    2: "Baja California",
+    3: "Baja California Sur",
+    4: "Campeche",
+    5: "Coahuila",
+    6: "Colima",
+    7: "Chiapas",
+    8: "Chihuahua",
+    9: "Ciudad de México",
+    10: "Durango",
+    11: "Guanajuato",
+    12: "Guerrero",
+    13: "Hidalgo",
+    14: "Jalisco",
+    15: "Estado de México",
+    16: "Michoacán",
+    17: "Morelos",
+    18: "Nayarit",
+    19: "Nuevo León",
+    20: "Oaxaca",
+    21: "Puebla",
+    22: "Querétaro",
+    23: "Quintana Roo",
+    24: "San Luis Potosí",
+    25: "Sinaloa",
+    26: "Sonora",
+    27: "Tabasco",
+    28: "Tamaulipas",
+    29: "Tlaxcala",
+    30: "Veracruz",
+    31: "Yucatán",
+    32: "Zacatecas",
+}
+
+ENTIDADES_INVERSO = {v: k for k, v in ENTIDADES.items()}
+
+
+PAISES = {
+    "Afganistán": "AFG",
+    "Albania": "ALB",
+    "Alemania": "DEU",
+    "Angola": "AGO",
+    "Anguila": "AIA",
+    "Antigua y Barbuda": "ATG",
+    "Antillas Holandesas": "ANT",
+    "Arabia Saudita": "SAU",
+    "Argelia": "DZA",
+    "Argentina": "ARG",
+    "Armenia": "ARM",
+    "Aruba": "ABW",
+    "Australia": "AUS",
+    "Austria": "AUT",
+    "Azerbaiyán": "AZE",
+    "Bahamas": "BHS",
+    "Bahrein": "BHR",
+    "Bangladesh": "BGD",
+    "Barbados": "BRB",
+    "Bélgica": "BEL",
+    "Belice": "BLZ",
+    "Benín": "BEN",
+    "Bermudas": "BMU",
+    "Bielorrusia": "BLR",
+    "Bolivia": "BOL",
+    "Bonaire": "BES",
+    "Bosnia-Herzegovina": "BIH",
+    "Botswana": "BWA",
+    "Brasil": "BRA",
+    "Brunei": "BRN",
+    "Bulgaria": "BGR",
+    "Burkina Faso": "BFA",
+    "Burundi": "BDI",
+    "Bután": "BTN",
+    "Cabo Verde": "CPV",
+    "Camboya": "KHM",
+    "Camerún": "CMR",
+    "Canadá": "CAN",
+    "Chad": "TCD",
+    "Chile": "CHL",
+    "China": "CHN",
+    "Chipre": "CYP",
+    "Cisjordania": "PSE",
+    "Colombia": "COL",
+    "Comores": "COM",
+    "Corea del Norte": "PRK",
+    "Corea del Sur": "KOR",
+    "Costa de Marfil": "CIV",
+    "Costa Rica": "CRI",
+    "Croacia": "HRV",
+    "Cuba": "CUB",
+    "Curazao": "CUW",
+    "Dinamarca": "DNK",
+    "Djibouti": "DJI",
+    "Dominica": "DMA",
+    "Ecuador": "ECU",
+    "Egipto": "EGY",
+    "El Salvador": "SLV",
+    "Emiratos Árabes Unidos": "ARE",
+    "Eslovaquia": "SVK",
+    "Eslovenia": "SVN",
+    "España": "ESP",
+    "Estados Unidos": "USA",
+    "Estonia": "EST",
+    "Etiopía": "ETH",
+    "Federación Rusa": "RUS",
+    "Filipinas": "PHL",
+    "Finlandia": "FIN",
+    "Fiyi": "FJI",
+    "Francia": "FRA",
+    "Gabón": "GAB",
+    "Gambia": "GMB",
+    "Georgia": "GEO",
+    "Ghana": "GHA",
+    "Gibraltar": "GIB",
+    "Granada": "GRD",
+    "Grecia": "GRC",
+    "Guadalupe": "GLP",
+    "Guam": "GUM",
+    "Guatemala": "GTM",
+    "Guayana Francesa": "GUF",
+    "Guinea Bisáu": "GNB",
+    "Guinea Ecuatorial": "GNQ",
+    "Guyana": "GUY",
+    "Haití": "HTI",
+    "Honduras": "HND",
+    "Hong Kong": "HKG",
+    "Hungría": "HUN",
+    "India": "IND",
+    "Indonesia": "IDN",
+    "Iraq": "IRQ",
+    "Irlanda": "IRL",
+    "Isla de San Martín": "SXM",
+    "Islandia": "ISL",
+    "Islas Caimán": "CYM",
+    "Islas Cocos": "CCK",
+    "Islas Cook": "COK",
+    "Islas Marshall": "MHL",
+    "Islas Salomón": "SLB",
+    "Islas Turcas y Caicos": "TCA",
+    "Islas Virgenes Americanas": "VIR",
+    "Islas Virgenes Británicas": "VGB",
+    "Israel": "ISR",
+    "Italia": "ITA",
+    "Jamaica": "JAM",
+    "Japón": "JPN",
+    "Jordania": "JOR",
+    "Kazajistán": "KAZ",
+    "Kenia": "KEN",
+    "Kirguistán": "KGZ",
+    "Kiribati": "KIR",
+    "Kosovo": "XKX",
+    "Kuwait": "KWT",
+    "Laos": "LAO",
+    "Letonia": "LVA",
+    "Líbano": "LBN",
+    "Liberia": "LBR",
+    "Libia": "LBY",
+    "Liechtenstein": "LIE",
+    "Lituania": "LTU",
+    "Luxemburgo": "LUX",
+    "Macao": "MAC",
+    "Macedonia": "MKD",
+    "Madagascar": "MDG",
+    "Malasia": "MYS",
+    "Malawi": "MWI",
+    "Maldivas": "MDV",
+    "Malí": "MLI",
+    "Malta": "MLT",
+    "Marianas del Norte": "MNP",
+    "Marruecos": "MAR",
+    "Martinica": "MTQ",
+    "Mauricio": "MUS",
+    "Mauritania": "MRT",
+    "Moldavia": "MDA",
+    "Mónaco": "MCO",
+    "Mongolia": "MNG",
+    "Montenegro": "MNE",
+    "Montserrat": "MSR",
+    "Mozambique": "MOZ",
+    "Myanmar, Birmania": "MMR",
+    "Namibia": "NAM",
+    "Nepal": "NPL",
+    "Nicaragua": "NIC",
+    "Niger": "NER",
+    "Nigeria": "NGA",
+    "Niue": "NIU",
+    "Noruega": "NOR",
+    "Nueva Caledonia": "NCL",
+    "Nueva Zelanda": "NZL",
+    "Omán": "OMN",
+    "Países Bajos": "NLD",
+    "Pakistán": "PAK",
+    "Palaos": "PLW",
+    "Palestina": "PSE",
+    "Panamá": "PAN",
+    "Papúa-Nueva Guinea": "PNG",
+    "Paraguay": "PRY",
+    "Perú": "PER",
+    "Polinesia Francesa": "PYF",
+    "Polonia": "POL",
+    "Portugal": "PRT",
+    "Qatar": "QAT",
+    "Reino de Lesoto": "LSO",
+    "Reino Unido": "GBR",
+    "República Centroafricana": "CAF",
+    "República Checa": "CZE",
+    "República de Abjasia": "ABK",
+    "República del Congo": "COG",
+    "República Democrática del Congo": "COD",
+    "República Dominicana": "DOM",
+    "República Guinea": "GIN",
+    "Reunión": "REU",
+    "Ruanda": "RWA",
+    "Rumanía": "ROU",
+    "Samoa": "WSM",
+    "San Cristobal y Nevis": "KNA",
+    "San Marino": "SMR",
+    "San Vincente y Granadinas": "VCT",
+    "Santa Lucía": "LCA",
+    "Santo Tomé y Príncipe": "STP",
+    "Senegal": "SEN",
+    "Serbia": "SRB",
+    "Sierra Leona": "SLE",
+    "Singapur": "SGP",
+    "Siria": "SYR",
+    "Sri Lanka": "LKA",
+    "Sudáfrica": "ZAF",
+    "Sudán": "SDN",
+    "Suecia": "SWE",
+    "Suiza": "CHE",
+    "Surinam": "SUR",
+    "Swazilandia": "SWZ",
+    "Tailandia": "THA",
+    "Taiwan": "TWN",
+    "Tanzania": "TZA",
+    "Tayikistán": "TJK",
+    "Timor Oriental": "TLS",
+    "Togo": "TGO",
+    "Trinidad y Tobago": "TTO",
+    "Túnez": "TUN",
+    "Turkmenistán": "TKM",
+    "Turquía": "TUR",
+    "Tuvalu": "TUV",
+    "Ucrania": "UKR",
+    "Uganda": "UGA",
+    "Uruguay": "URY",
+    "Uzbekistán": "UZB",
+    "Vanuatu": "VUT",
+    "Venezuela": "VEN",
+    "Vietnam": "VNM",
+    "Yemen": "YEM",
+    "Zambia": "ZMB",
+    "Zimbabwe": "ZWE",
+    "No Identificado": "XXX",
+}
+
+
+ABREVIACIONES_USA = {
+    "Alabama": "AL",
+    "Alaska": "AK",
+    "Arizona": "AZ",
+    "Arkansas": "AR",
+    "California": "CA",
+    "Colorado": "CO",
+    "Connecticut": "CT",
+    "Delaware": "DE",
+    "Florida": "FL",
+    "Georgia": "GA",
+    "Hawaii": "HI",
+    "Idaho": "ID",
+    "Illinois": "IL",
+    "Indiana": "IN",
+    "Iowa": "IA",
+    "Kansas": "KS",
+    "Kentucky": "KY",
+    "Luisiana": "LA",
+    "Maine": "ME",
+    "Maryland": "MD",
+    "Massachusetts": "MA",
+    "Michigan": "MI",
+    "Minnesota": "MN",
+    "Mississipi": "MS",
+    "Misuri": "MO",
+    "Montana": "MT",
+    "Nebraska": "NE",
+    "Nevada": "NV",
+    "Nuevo Hampshire": "NH",
+    "Nueva Jersey": "NJ",
+    "Nuevo Mexico": "NM",
+    "Nueva York": "NY",
+    "Carolina Del Norte": "NC",
+    "Dakota Del Norte": "ND",
+    "Ohio": "OH",
+    "Oklahoma": "OK",
+    "Oregon": "OR",
+    "Pensilvania": "PA",
+    "Puerto Rico": "PR",
+    "Rhode Island": "RI",
+    "Carolina Del Sur": "SC",
+    "Dakota Del Sur": "SD",
+    "Tennessee": "TN",
+    "Texas": "TX",
+    "Utah": "UT",
+    "Vermont": "VT",
+    "Virginia": "VA",
+    "Washington": "WA",
+    "Washington, D.C.": "DC",
+    "West Virginia": "WV",
+    "Wisconsin": "WI",
+    "Wyoming": "WY",
+    "No Identificado": "XX",
+}
@@ -0,0 +1,245 @@
+"""
+Este módulo contiene el cliente HTTP compartido por todas las descargas.
+
+El cliente reutiliza las conexiones abiertas con cada servidor (keep-alive),
+de modo que solo la primera solicitud paga el costo de abrir la conexión
+y negociar TLS. Además limita el número de solicitudes simultáneas por
+servidor, sigue las redirecciones (abriendo una conexión con el nuevo
+servidor si es distinto) y reintenta las solicitudes fallidas con una
+espera exponencial.
+"""
+
+import http.client
+import random
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlparse
+from urllib.request import urlopen
+
+
+# Tiempo máximo de espera (en segundos) para conectarse y para cada lectura.
+TIEMPO_ESPERA = 120
+
+# Número máximo de solicitudes simultáneas a un mismo servidor.
+MAX_POR_SERVIDOR = 4
+
+# Número de reintentos después del primer intento fallido.
+REINTENTOS = 4
+
+# Espera (en segundos) antes del primer reintento, se duplica en cada reintento.
+ESPERA_INICIAL = 1
+
+# Espera máxima (en segundos) entre reintentos.
+ESPERA_MAXIMA = 30
+
+# Códigos de respuesta que indican una falla temporal del servidor.
+CODIGOS_REINTENTO = {429, 500, 502, 503, 504}
+
+# Códigos de respuesta que indican que el recurso está en otra URL.
+CODIGOS_REDIRECCION = {301, 302, 303, 307, 308}
+
+# Número máximo de redirecciones que se siguen en cada solicitud.
+MAX_REDIRECCIONES = 5
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP con conexiones persistentes, reintentos y límite por servidor.
+
+    Se puede usar desde varios hilos al mismo tiempo.
+
+    Parameters
+    ----------
+    max_por_servidor : int
+        Número máximo de solicitudes simultáneas a un mismo servidor.
+
+    reintentos : int
+        Número de reintentos después del primer intento fallido.
+
+    espera_inicial : float
+        Espera (en segundos) antes del primer reintento.
+
+    tiempo_espera : float
+        Tiempo máximo de espera (en segundos) para conectarse y para cada lectura.
+
+    """
+
+    def __init__(
+        self,
+        max_por_servidor=MAX_POR_SERVIDOR,
+        reintentos=REINTENTOS,
+        espera_inicial=ESPERA_INICIAL,
+        tiempo_espera=TIEMPO_ESPERA,
+    ):
+        self.max_por_servidor = max_por_servidor
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+        self.tiempo_espera = tiempo_espera
+
+        self._candado = threading.Lock()
+        self._semaforos = dict()
+        self._libres = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def _servidor(self, partes):
+        """
+        Regresa el semáforo y la lista de conexiones libres de un servidor.
+        """
+
+        llave = (partes.scheme, partes.netloc)
+
+        with self._candado:
+            if llave not in self._semaforos:
+                semaforo = threading.BoundedSemaphore(self.max_por_servidor)
+                self._semaforos[llave] = semaforo
+                self._libres[llave] = list()
+
+            return self._semaforos[llave], self._libres[llave]
+
+    def _solicitar(self, partes):
+        """
+        Realiza una solicitud GET y regresa la respuesta y su contenido.
+        """
+
+        semaforo, libres = self._servidor(partes)
+
+        with semaforo:
+            with self._candado:
+                conexion = libres.pop() if libres else None
+
+            if conexion is None:
+                clase = (
+                    http.client.HTTPSConnection
+                    if partes.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conexion = clase(partes.netloc, timeout=self.tiempo_espera)
+
+            ruta = partes.path or "/"
+
+            if partes.query:
+                ruta = f"{ruta}?{partes.query}"
+
+            try:
+                conexion.request("GET", ruta)
+                respuesta = conexion.getresponse()
+                contenido = respuesta.read()
+            except Exception:
+                conexion.close()
+                raise
+
+            # Solo regresamos la conexión si el servidor la mantiene abierta.
+            if respuesta.will_close:
+                conexion.close()
+            else:
+                with self._candado:
+                    libres.append(conexion)
+
+        return respuesta, contenido
+
+    def _seguir_redirecciones(self, url):
+        """
+        Realiza una solicitud GET siguiendo las redirecciones.
+
+        Regresa la URL final, la respuesta y su contenido. Si se excede
+        MAX_REDIRECCIONES o la redirección no es HTTP, se regresa la última
+        respuesta de redirección para que se reporte como error.
+        """
+
+        partes = urlparse(url)
+
+        for _ in range(MAX_REDIRECCIONES + 1):
+            respuesta, contenido = self._solicitar(partes)
+            destino = respuesta.headers.get("Location")
+
+            if respuesta.status not in CODIGOS_REDIRECCION or destino is None:
+                break
+
+            siguiente = urljoin(url, destino)
+
+            if urlparse(siguiente).scheme not in ("http", "https"):
+                break
+
+            # Si el servidor es distinto, _solicitar() abre una nueva conexión.
+            url = siguiente
+            partes = urlparse(url)
+
+        return url, respuesta, contenido
+
+    def obtener(self, url):
+        """
+        Descarga una URL y regresa su contenido en bytes.
+
+        Las redirecciones 301, 302, 303, 307 y 308 se siguen hasta
+        MAX_REDIRECCIONES veces. Las fallas de conexión y las respuestas
+        429 y 5xx se reintentan con una espera exponencial. Las URLs que
+        no son HTTP (por ejemplo file://) se leen directamente.
+
+        Parameters
+        ----------
+        url : str
+            La URL que se desea descargar.
+
+        Returns
+        -------
+        bytes
+            El contenido crudo de la respuesta.
+
+        Raises
+        ------
+        urllib.error.HTTPError
+            Si el servidor responde con un error que no es temporal,
+            si se excede el número de redirecciones o si se agotan
+            los reintentos.
+
+        OSError
+            Si no se pudo establecer la conexión después de todos los reintentos.
+
+        """
+
+        partes = urlparse(url)
+
+        if partes.scheme not in ("http", "https"):
+            with urlopen(url, timeout=self.tiempo_espera) as respuesta:
+                return respuesta.read()
+
+        for intento in range(self.reintentos + 1):
+            try:
+                final, respuesta, contenido = self._seguir_redirecciones(url)
+            except (OSError, http.client.HTTPException) as error:
+                ultimo_error = error
+            else:
+                if respuesta.status == 200:
+                    return contenido
+
+                ultimo_error = HTTPError(
+                    final, respuesta.status, respuesta.reason, respuesta.headers, None
+                )
+
+                if respuesta.status not in CODIGOS_REINTENTO:
+                    raise ultimo_error
+
+            if intento < self.reintentos:
+                # Agregamos un poco de azar para que los hilos no reintenten al mismo tiempo.
+                espera = min(self.espera_inicial * 2**intento, ESPERA_MAXIMA)
+                time.sleep(espera * random.uniform(0.5, 1))
+
+        raise ultimo_error
+
+    def cerrar(self):
+        """
+        Cierra todas las conexiones libres.
+        """
+
+        with self._candado:
+            for libres in self._libres.values():
+                for conexion in libres:
+                    conexion.close()
+
+                libres.clear()
@@ -0,0 +1,183 @@
+"""
+Este módulo permite consultar solo una parte de un conjunto de datos.
+
+Las consultas se resuelven con los índices de la base de datos SQLite
+generada por almacen.py, de modo que solo se leen los registros del
+rango de años y de los valores de las columnas indicadas. Si la base de
+datos no existe o es más antigua que el archivo de la tabla, la consulta
+se resuelve filtrando el archivo completo, con el mismo resultado.
+
+Ejemplo:
+
+    consultar("remesas_pais_anual", 2025, 2025, FLUJO="Ingresos")
+    consultar("remesas_entidad", 2016, 2025, CVE_ENT=[14, 16])
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from almacen import RUTA_ALMACEN, almacen_vigente, leer_tabla, obtener_llaves
+from esquemas import ESQUEMAS, aplicar_esquema
+
+
+def construir_condiciones(primer_año, ultimo_año, filtros):
+    """
+    Construye la cláusula WHERE de una consulta y sus parámetros.
+
+    Parameters
+    ----------
+    primer_año : int
+        El primer año de la consulta. Si es None no hay límite inferior.
+
+    ultimo_año : int
+        El último año de la consulta. Si es None no hay límite superior.
+
+    filtros : dict
+        Diccionario con el nombre de cada columna como llave y el valor
+        o la lista de valores permitidos como valor.
+
+    Returns
+    -------
+    tuple
+        El texto de la cláusula WHERE y la lista de parámetros.
+
+    """
+
+    condiciones = list()
+    parametros = list()
+
+    if primer_año is not None:
+        condiciones.append("PERIODO >= ?")
+        parametros.append(f"{primer_año}-01-01")
+
+    if ultimo_año is not None:
+        condiciones.append("PERIODO < ?")
+        parametros.append(f"{ultimo_año + 1}-01-01")
+
+    for columna, valor in filtros.items():
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        marcadores = ", ".join("?" for _ in valores)
+        condiciones.append(f'"{columna}" IN ({marcadores})')
+        parametros.extend(valores)
+
+    if not condiciones:
+        return "", parametros
+
+    return "WHERE " + " AND ".join(condiciones), parametros
+
+
+def consultar_almacen(nombre, primer_año, ultimo_año, filtros):
+    """
+    Consulta una tabla en la base de datos SQLite.
+
+    Los parámetros son los mismos que los de consultar().
+
+    """
+
+    conexion = sqlite3.connect(f"file:{RUTA_ALMACEN}?mode=ro", uri=True)
+
+    try:
+        columnas = [
+            fila[1] for fila in conexion.execute(f'PRAGMA table_info("{nombre}")')
+        ]
+
+        desconocidas = set(filtros) - set(columnas)
+
+        if desconocidas:
+            raise ValueError(
+                f"La tabla {nombre} no tiene las columnas {sorted(desconocidas)}"
+            )
+
+        condiciones, parametros = construir_condiciones(
+            primer_año, ultimo_año, filtros
+        )
+        orden = ", ".join(obtener_llaves(nombre))
+
+        df = pd.read_sql_query(
+            f'SELECT * FROM "{nombre}" {condiciones} ORDER BY {orden}',
+            conexion,
+            params=parametros,
+        )
+    finally:
+        conexion.close()
+
+    df["PERIODO"] = pd.to_datetime(df["PERIODO"]).astype("datetime64[ns]")
+
+    return df
+
+
+def filtrar_tabla(nombre, primer_año, ultimo_año, filtros):
+    """
+    Lee una tabla completa desde su archivo y la filtra.
+
+    Los parámetros son los mismos que los de consultar().
+
+    """
+
+    df = leer_tabla(nombre)
+
+    desconocidas = set(filtros) - set(df.columns)
+
+    if desconocidas:
+        raise ValueError(
+            f"La tabla {nombre} no tiene las columnas {sorted(desconocidas)}"
+        )
+
+    seleccion = pd.Series(True, index=df.index)
+
+    if primer_año is not None:
+        seleccion &= df["PERIODO"].dt.year >= primer_año
+
+    if ultimo_año is not None:
+        seleccion &= df["PERIODO"].dt.year <= ultimo_año
+
+    for columna, valor in filtros.items():
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        seleccion &= df[columna].isin(valores)
+
+    return df[seleccion].sort_values(obtener_llaves(nombre), ignore_index=True)
+
+
+def consultar(nombre, primer_año=None, ultimo_año=None, **filtros):
+    """
+    Consulta los registros de un conjunto de datos dentro de un rango
+    de años y con los valores indicados en cada columna.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del conjunto de datos, por ejemplo 'remesas_pais_anual'.
+
+    primer_año : int
+        El primer año de la consulta. Por defecto no hay límite inferior.
+
+    ultimo_año : int
+        El último año de la consulta. Por defecto no hay límite superior.
+
+    **filtros
+        El valor o la lista de valores permitidos de cada columna,
+        por ejemplo FLUJO="Ingresos" o CVE_ENT=[14, 16].
+
+    Returns
+    -------
+    pandas.DataFrame
+        Los registros ordenados por sus llaves. Los conjuntos de datos
+        generados por el ETL tienen los tipos definidos en su esquema.
+
+    Raises
+    ------
+    ValueError
+        Si alguno de los filtros no es una columna de la tabla.
+
+    """
+
+    if almacen_vigente(nombre):
+        df = consultar_almacen(nombre, primer_año, ultimo_año, filtros)
+    else:
+        df = filtrar_tabla(nombre, primer_año, ultimo_año, filtros)
+
+    if nombre in ESQUEMAS:
+        df = aplicar_esquema(df, nombre)
+
+    return df
@@ -0,0 +1,261 @@
+"""
+Este módulo centraliza la carga de los conjuntos de datos
+generados por etl.py.
+
+El ETL guarda cada archivo CSV junto con una versión en formato Parquet
+con los tipos de datos definidos en esquemas.py. Si la
+versión Parquet existe y es más reciente que el CSV, se carga en su lugar,
+lo cual evita interpretar el texto y las fechas en cada lectura.
+
+Los agregados anuales y trimestrales (definidos en esquemas.AGREGADOS)
+también son generados por el ETL. Si alguno no existe, se calcula a
+partir de su conjunto de datos de origen al momento de cargarlo.
+Lo mismo ocurre con los deflactores, que se calculan a partir del INPC
+y del tipo de cambio.
+
+Cada archivo se lee una sola vez por proceso. Los conjuntos de datos
+leídos se conservan en memoria con la fecha de modificación de sus
+archivos y su esquema como llave, por lo que se vuelven a leer si el
+archivo cambia. Cada llamada regresa una copia, por lo que se puede
+modificar sin alterar la versión en memoria ni las de otras llamadas.
+"""
+
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from esquemas import (
+    AGREGADOS,
+    DEFLACTORES,
+    ESQUEMAS,
+    INDICES_INPC,
+    aplicar_esquema,
+    leer_csv,
+)
+
+
+# Columnas que se suman al calcular los agregados.
+COLUMNAS_SUMA = ["OPERACIONES", "VALOR_USD"]
+
+# Frecuencia de pandas.Period que corresponde a cada frecuencia de los esquemas.
+PERIODOS = {"MS": "M", "QS": "Q", "YS": "Y"}
+
+# Número máximo de conjuntos de datos que se conservan en memoria.
+MAX_EN_MEMORIA = 8
+
+
+def ruta_parquet(ruta):
+    """
+    Regresa la ruta de la versión Parquet de un archivo CSV.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta del archivo CSV.
+
+    Returns
+    -------
+    str
+        La ruta del archivo Parquet.
+
+    """
+
+    return f"{os.path.splitext(ruta)[0]}.parquet"
+
+
+def modificaciones(ruta):
+    """
+    Regresa la fecha de modificación de un CSV y de su versión Parquet.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta del archivo CSV.
+
+    Returns
+    -------
+    tuple
+        Las fechas en nanosegundos. La del Parquet es None si no existe.
+
+    """
+
+    parquet = ruta_parquet(ruta)
+
+    return (
+        os.stat(ruta).st_mtime_ns,
+        os.stat(parquet).st_mtime_ns if os.path.exists(parquet) else None,
+    )
+
+
+@lru_cache(maxsize=MAX_EN_MEMORIA)
+def leer_archivo(nombre, modificaciones, columnas):
+    """
+    Lee un conjunto de datos desde su archivo CSV o Parquet.
+
+    Los resultados se conservan en memoria. Las fechas de modificación
+    y las columnas del esquema no se usan en la lectura, solo forman parte
+    de la llave, así un archivo que cambia se vuelve a leer.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    modificaciones : tuple
+        Las fechas de modificación generadas por modificaciones().
+
+    columnas : tuple
+        Las columnas del esquema y sus tipos.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El conjunto de datos compartido por todas las llamadas.
+
+    """
+
+    csv, parquet = modificaciones
+
+    # Solo usamos la versión Parquet si está al día con el CSV.
+    if parquet is not None and parquet >= csv:
+        return aplicar_esquema(
+            pd.read_parquet(ruta_parquet(ESQUEMAS[nombre]["ruta"])), nombre
+        )
+
+    return leer_csv(nombre)
+
+
+def cargar(nombre, indice=None):
+    """
+    Carga un conjunto de datos con los tipos definidos en su esquema.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS, por ejemplo 'remesas_pais'.
+
+    indice : str
+        La columna que se usará como índice. Por defecto no se asigna.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El conjunto de datos.
+
+    """
+
+    esquema = ESQUEMAS[nombre]
+    ruta = esquema["ruta"]
+
+    # Los agregados y deflactores que no han sido generados se calculan al momento.
+    if not os.path.exists(ruta) and nombre in AGREGADOS:
+        df = calcular_agregado(nombre)
+    elif not os.path.exists(ruta) and nombre in DEFLACTORES.values():
+        df = calcular_deflactores(nombre)
+    else:
+        df = leer_archivo(
+            nombre,
+            modificaciones(ruta),
+            tuple(esquema["columnas"].items()),
+        ).copy()
+
+    if indice is not None:
+        df = df.set_index(indice)
+
+    return df
+
+
+def calcular_agregado(nombre):
+    """
+    Calcula un agregado sumando las cifras de su conjunto de datos de origen.
+
+    Los registros se agrupan por el periodo de la frecuencia del agregado
+    y por el resto de las columnas descriptivas del origen.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del agregado en esquemas.AGREGADOS.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El agregado con los tipos definidos en su esquema.
+
+    """
+
+    origen, frecuencia = AGREGADOS[nombre]
+
+    df = cargar(origen)
+
+    # Llevamos cada fecha al inicio de su trimestre o año.
+    df["PERIODO"] = df["PERIODO"].dt.to_period(PERIODOS[frecuencia]).dt.start_time
+
+    columnas = [col for col in df.columns if col not in COLUMNAS_SUMA]
+
+    df = df.groupby(columnas, observed=True, sort=False, as_index=False).sum()
+
+    return aplicar_esquema(df, nombre)
+
+
+def calcular_deflactores(nombre):
+    """
+    Calcula los deflactores a partir del INPC y del tipo de cambio.
+
+    El factor de cada índice lleva los precios de cada periodo a los
+    del último mes con INPC y tipo de cambio. El multiplicador es el factor por el
+    tipo de cambio, por lo que convierte dólares corrientes a pesos
+    constantes. Los deflactores trimestrales son el promedio de los
+    valores mensuales de cada trimestre.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de los deflactores en esquemas.DEFLACTORES.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Los deflactores con los tipos definidos en su esquema.
+
+    """
+
+    ipc = cargar("IPC", indice="PERIODO")
+    fx = cargar("USDMXN", indice="PERIODO")
+
+    # Unimos los DataFrames y quitamos las filas incompletas antes de escoger
+    # la referencia, así su mes es el último con INPC y tipo de cambio.
+    df = pd.concat([fx, ipc.add_prefix("INPC_")], axis=1).dropna(axis=0)
+
+    # Escogemos el IPC más reciente como referencia para cada índice.
+    for indice in INDICES_INPC:
+        inpc = df[f"INPC_{indice}"]
+        df[f"FACTOR_{indice}"] = inpc.iloc[-1] / inpc
+
+    if ESQUEMAS[nombre]["frecuencia"] == "QS":
+        df = df.resample("QS").mean()
+
+    for indice in INDICES_INPC:
+        df[f"MULTIPLICADOR_{indice}"] = df[f"FACTOR_{indice}"] * df["TIPO_CAMBIO"]
+
+    return aplicar_esquema(df.reset_index(), nombre)
+
+
+def cargar_deflactores(frecuencia="MS"):
+    """
+    Carga los deflactores mensuales o trimestrales.
+
+    Parameters
+    ----------
+    frecuencia : str
+        Puede ser 'MS' (mensual) o 'QS' (trimestral).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Los deflactores con el periodo como índice.
+
+    """
+
+    return cargar(DEFLACTORES[frecuencia], indice="PERIODO")
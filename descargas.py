@@ -0,0 +1,259 @@
+"""
+Este módulo se encarga de descargar los cuadros del
+Sistema de Información Económica (SIE) de Banxico.
+
+Las descargas se realizan de forma concurrente y se regresan
+los bytes crudos de cada archivo XLS, los cuales son
+procesados posteriormente por las funciones de etl.py.
+
+Cada archivo descargado se guarda en una caché local junto con
+su hash SHA-256 y la fecha de descarga. Esto permite repetir una
+ejecución sin volver a descargar todo.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from conexiones import MAX_POR_SERVIDOR, ClienteHTTP
+from instrumentacion import medir
+from puntos_control import archivo_temporal
+
+
+# Servidor del SIE de Banxico.
+SIE_HOST = "https://www.banxico.org.mx"
+
+# Número máximo de descargas simultáneas.
+MAX_HILOS = 4
+
+# Carpeta donde se guardan los archivos crudos.
+CARPETA_CACHE = "./cache/sie"
+
+# Tiempo (en segundos) durante el cual un archivo en caché se considera vigente.
+TTL_CACHE = 12 * 60 * 60
+
+
+def ruta_cache(cuadro, url):
+    """
+    Regresa la ruta base en caché de un cuadro.
+
+    La llave se forma con el servidor, el ID del cuadro y el rango
+    de fechas solicitado en la URL. Así, los archivos de un servidor
+    local de pruebas nunca se confunden con los de Banxico.
+
+    Parameters
+    ----------
+    cuadro : str
+        El ID del cuadro.
+
+    url : str
+        La URL del cuadro.
+
+    Returns
+    -------
+    str
+        La ruta sin extensión del archivo en caché.
+
+    """
+
+    partes = urlparse(url)
+    servidor = partes.netloc.replace(":", "_") or "local"
+
+    parametros = parse_qs(partes.query)
+    fecha_inicio = parametros.get("fechaInicio", [""])[0]
+    fecha_fin = parametros.get("fechaFin", [""])[0]
+
+    return os.path.join(
+        CARPETA_CACHE, servidor, f"{cuadro}_{fecha_inicio}_{fecha_fin}"
+    )
+
+
+def leer_metadatos(ruta):
+    """
+    Lee los metadatos de un archivo en caché.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta sin extensión del archivo en caché.
+
+    Returns
+    -------
+    dict
+        Los metadatos o un diccionario vacío si no existen.
+
+    """
+
+    if not os.path.exists(f"{ruta}.json"):
+        return dict()
+
+    with open(f"{ruta}.json", "r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def escribir_metadatos(ruta, metadatos):
+    """
+    Escribe los metadatos de un archivo en caché.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta sin extensión del archivo en caché.
+
+    metadatos : dict
+        Los metadatos que se desean guardar.
+
+    """
+
+    with archivo_temporal(f"{ruta}.json") as temporal:
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(metadatos, archivo, indent=4)
+
+
+def obtener_cuadro(cuadro, url, cliente, ttl=TTL_CACHE, offline=False):
+    """
+    Obtiene el contenido de un cuadro, ya sea de la caché o de Banxico.
+
+    Parameters
+    ----------
+    cuadro : str
+        El ID del cuadro.
+
+    url : str
+        La URL del cuadro.
+
+    cliente : ClienteHTTP
+        El cliente HTTP compartido por todas las descargas.
+
+    ttl : int
+        Tiempo (en segundos) durante el cual la caché se considera vigente.
+
+    offline : bool
+        Si es True, solo se usará la caché y nunca se descargará el archivo.
+
+    Returns
+    -------
+    bytes
+        El contenido crudo del archivo.
+
+    """
+
+    ruta = ruta_cache(cuadro, url)
+    metadatos = leer_metadatos(ruta)
+
+    en_cache = bool(metadatos) and os.path.exists(f"{ruta}.xls")
+    vigente = en_cache and time.time() - metadatos["fecha_descarga"] < ttl
+
+    if offline and not en_cache:
+        raise FileNotFoundError(f"El cuadro {cuadro} no se encuentra en caché: {ruta}")
+
+    if offline or vigente:
+        with open(f"{ruta}.xls", "rb") as archivo:
+            contenido = archivo.read()
+    else:
+        with medir("descarga", cuadro) as medicion:
+            contenido = cliente.obtener(url)
+            medicion["bytes_descarga"] = len(contenido)
+
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+        with archivo_temporal(f"{ruta}.xls") as temporal:
+            with open(temporal, "wb") as archivo:
+                archivo.write(contenido)
+
+        metadatos["url"] = url
+        metadatos["sha256"] = hashlib.sha256(contenido).hexdigest()
+        metadatos["fecha_descarga"] = time.time()
+
+        escribir_metadatos(ruta, metadatos)
+
+    return contenido
+
+
+def redirigir_urls(urls, origen):
+    """
+    Redirige las URLs del SIE hacia un origen alternativo.
+
+    Esto permite ejecutar el ETL sin conexión a Banxico, ya sea con
+    una carpeta de archivos grabados o con un servidor HTTP local.
+
+    Parameters
+    ----------
+    urls : dict
+        Diccionario con el ID del cuadro como llave y su URL como valor.
+
+    origen : str
+        Una URL base (por ejemplo 'http://localhost:8000') que reemplaza
+        al servidor de Banxico, o una carpeta con un archivo
+        '{ID del cuadro}.xls' por cada cuadro.
+
+    Returns
+    -------
+    dict
+        Diccionario con el ID del cuadro como llave y su nueva URL como valor.
+
+    """
+
+    if origen.startswith(("http://", "https://")):
+        return {
+            cuadro: url.replace(SIE_HOST, origen.rstrip("/"), 1)
+            for cuadro, url in urls.items()
+        }
+
+    return {cuadro: Path(origen, f"{cuadro}.xls").resolve().as_uri() for cuadro in urls}
+
+
+def descargar_cuadros(
+    urls,
+    max_hilos=MAX_HILOS,
+    ttl=TTL_CACHE,
+    offline=False,
+    max_por_servidor=MAX_POR_SERVIDOR,
+):
+    """
+    Descarga varios cuadros del SIE de forma concurrente.
+
+    El tiempo total de la descarga es aproximadamente
+    el del cuadro más lento, en lugar de la suma de todos.
+    Todas las descargas comparten un mismo cliente HTTP que
+    reutiliza las conexiones y reintenta las fallas temporales.
+
+    Parameters
+    ----------
+    urls : dict
+        Diccionario con el ID del cuadro como llave y su URL como valor.
+
+    max_hilos : int
+        El número máximo de descargas simultáneas.
+
+    ttl : int
+        Tiempo (en segundos) durante el cual la caché se considera vigente.
+
+    offline : bool
+        Si es True, solo se usará la caché y nunca se descargarán los archivos.
+
+    max_por_servidor : int
+        El número máximo de descargas simultáneas a un mismo servidor.
+
+    Returns
+    -------
+    dict
+        Diccionario con el ID del cuadro como llave y el contenido crudo
+        del archivo como valor.
+
+    """
+
+    with ClienteHTTP(max_por_servidor) as cliente, ThreadPoolExecutor(
+        max_workers=max_hilos
+    ) as executor:
+        futuros = {
+            cuadro: executor.submit(obtener_cuadro, cuadro, url, cliente, ttl, offline)
+            for cuadro, url in urls.items()
+        }
+
+        # Si alguna descarga falla, la excepción se propaga aquí.
+        return {cuadro: futuro.result() for cuadro, futuro in futuros.items()}
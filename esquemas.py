@@ -0,0 +1,228 @@
+"""
+Este módulo define el esquema de cada conjunto de datos del proyecto.
+
+Cada esquema indica la ruta del archivo, el tipo de dato de cada columna,
+las columnas que identifican a cada registro y la frecuencia del periodo.
+Opcionalmente indica el nombre que corresponde a cada código y el rango
+permitido de las columnas numéricas, los cuales usa validacion.py.
+Tanto etl.py al escribir como datos.py al leer utilizan estos esquemas,
+de modo que las etiquetas repetidas se guardan como categorías y las
+claves pequeñas con enteros compactos.
+"""
+
+import pandas as pd
+
+from catalogos import ABREVIACIONES_USA, ENTIDADES, PAISES
+
+
+FLUJOS = pd.CategoricalDtype(["Ingresos", "Egresos"])
+
+NOMBRES_ENTIDADES = pd.CategoricalDtype(list(ENTIDADES.values()))
+
+
+ESQUEMAS = {
+    "IPC": {
+        "ruta": "./assets/IPC.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "GENERAL": "float64",
+            "SUBYACENTE": "float64",
+            "NO_SUBYACENTE": "float64",
+        },
+        "llaves": ["PERIODO"],
+        "frecuencia": "MS",
+        "rangos": {
+            "GENERAL": (0.01, None),
+            "SUBYACENTE": (0.01, None),
+            "NO_SUBYACENTE": (0.01, None),
+        },
+    },
+    "USDMXN": {
+        "ruta": "./assets/USDMXN.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "TIPO_CAMBIO": "float64",
+        },
+        "llaves": ["PERIODO"],
+        "frecuencia": "MS",
+        "rangos": {"TIPO_CAMBIO": (1, 100)},
+    },
+    "remesas_mensuales": {
+        "ruta": "./data/remesas_mensuales.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "ID_FLUJO": "int8",
+            "FLUJO": FLUJOS,
+            "OPERACIONES": "int64",
+            "VALOR_USD": "int64",
+        },
+        "llaves": ["PERIODO", "ID_FLUJO"],
+        "frecuencia": "MS",
+        "nombres": {"ID_FLUJO": "FLUJO"},
+        "rangos": {"OPERACIONES": (1, None), "VALOR_USD": (1, None)},
+    },
+    "remesas_entidad": {
+        "ruta": "./data/remesas_entidad.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "CVE_ENT": "int8",
+            "ENTIDAD": NOMBRES_ENTIDADES,
+            "VALOR_USD": "int64",
+        },
+        "llaves": ["PERIODO", "CVE_ENT"],
+        "frecuencia": "QS",
+        "nombres": {"CVE_ENT": "ENTIDAD"},
+        # Todas las entidades reciben remesas cada trimestre.
+        "rangos": {"CVE_ENT": (1, 32), "VALOR_USD": (1, None)},
+    },
+    "remesas_pais": {
+        "ruta": "./data/remesas_pais.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "ID_PAIS": pd.CategoricalDtype(sorted(set(PAISES.values()))),
+            "PAIS": pd.CategoricalDtype(sorted(PAISES)),
+            "ID_FLUJO": "int8",
+            "FLUJO": FLUJOS,
+            "VALOR_USD": "int64",
+        },
+        "llaves": ["PERIODO", "ID_PAIS", "ID_FLUJO"],
+        "frecuencia": "QS",
+        "nombres": {"ID_PAIS": "PAIS", "ID_FLUJO": "FLUJO"},
+        "rangos": {"VALOR_USD": (0, None)},
+    },
+    "remesas_municipio": {
+        "ruta": "./data/remesas_municipio.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "CVE_GEO": "category",
+            "ENTIDAD": NOMBRES_ENTIDADES,
+            "MUNICIPIO": "category",
+            "VALOR_USD": "int64",
+        },
+        "llaves": ["PERIODO", "CVE_GEO"],
+        "frecuencia": "QS",
+        "nombres": {"CVE_GEO": "MUNICIPIO"},
+        "rangos": {"VALOR_USD": (0, None)},
+    },
+    "remesas_usa": {
+        "ruta": "./data/remesas_usa.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "ID_ESTADO": pd.CategoricalDtype(sorted(ABREVIACIONES_USA.values())),
+            "ESTADO": pd.CategoricalDtype(sorted(ABREVIACIONES_USA)),
+            "VALOR_USD": "int64",
+        },
+        "llaves": ["PERIODO", "ID_ESTADO"],
+        "frecuencia": "QS",
+        "nombres": {"ID_ESTADO": "ESTADO"},
+        "rangos": {"VALOR_USD": (0, None)},
+    },
+}
+
+
+# Conjuntos de datos agregados. La llave es el nombre del agregado y el valor
+# es el conjunto de datos de origen y la frecuencia a la que se suman sus cifras.
+AGREGADOS = {
+    "remesas_nacional_trimestral": ("remesas_mensuales", "QS"),
+    "remesas_nacional_anual": ("remesas_mensuales", "YS"),
+    "remesas_entidad_anual": ("remesas_entidad", "YS"),
+    "remesas_pais_anual": ("remesas_pais", "YS"),
+    "remesas_municipio_anual": ("remesas_municipio", "YS"),
+    "remesas_usa_anual": ("remesas_usa", "YS"),
+}
+
+# Cada agregado conserva las columnas, llaves y reglas de su origen.
+for nombre, (origen, frecuencia) in AGREGADOS.items():
+    ESQUEMAS[nombre] = {
+        **ESQUEMAS[origen],
+        "ruta": f"./data/{nombre}.csv",
+        "frecuencia": frecuencia,
+    }
+
+
+# Índices del INPC con los que se puede deflactar.
+INDICES_INPC = ["GENERAL", "SUBYACENTE", "NO_SUBYACENTE"]
+
+# Deflactores mensuales y trimestrales. Por cada índice del INPC incluyen
+# su nivel, el factor que lleva los precios al último INPC disponible y el
+# multiplicador que convierte dólares corrientes a pesos constantes.
+DEFLACTORES = {"MS": "deflactores_mensuales", "QS": "deflactores_trimestrales"}
+
+for frecuencia, nombre in DEFLACTORES.items():
+    ESQUEMAS[nombre] = {
+        "ruta": f"./assets/{nombre}.csv",
+        "columnas": {
+            "PERIODO": "datetime64[ns]",
+            "TIPO_CAMBIO": "float64",
+            **{f"INPC_{indice}": "float64" for indice in INDICES_INPC},
+            **{f"FACTOR_{indice}": "float64" for indice in INDICES_INPC},
+            **{f"MULTIPLICADOR_{indice}": "float64" for indice in INDICES_INPC},
+        },
+        "llaves": ["PERIODO"],
+        "frecuencia": frecuencia,
+        "rangos": {
+            "TIPO_CAMBIO": (1, 100),
+            **{f"INPC_{indice}": (0.01, None) for indice in INDICES_INPC},
+            **{f"FACTOR_{indice}": (0.01, None) for indice in INDICES_INPC},
+            **{f"MULTIPLICADOR_{indice}": (0.01, None) for indice in INDICES_INPC},
+        },
+    }
+
+
+def aplicar_esquema(df, nombre):
+    """
+    Ordena las columnas de un DataFrame y les asigna los tipos de su esquema.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El DataFrame con todas las columnas del esquema.
+
+    nombre : str
+        El nombre del conjunto de datos.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El DataFrame con los tipos de datos del esquema.
+
+    """
+
+    columnas = ESQUEMAS[nombre]["columnas"]
+
+    return df[list(columnas)].astype(columnas)
+
+
+def leer_csv(nombre):
+    """
+    Lee el archivo CSV de un conjunto de datos con los tipos de su esquema.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre del conjunto de datos.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El conjunto de datos.
+
+    """
+
+    esquema = ESQUEMAS[nombre]
+
+    # Las fechas se interpretan aparte, el resto de las columnas se leen directo.
+    columnas = esquema["columnas"]
+
+    fechas = [col for col, tipo in columnas.items() if tipo == "datetime64[ns]"]
+    tipos = {col: tipo for col, tipo in columnas.items() if col not in fechas}
+
+    # Leemos los flotantes sin pérdida para que coincidan con los escritos.
+    df = pd.read_csv(
+        esquema["ruta"],
+        dtype=tipos,
+        parse_dates=fechas,
+        float_precision="round_trip",
+    )
+
+    return aplicar_esquema(df, nombre)
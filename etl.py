@@ -3,9 +3,30 @@ Este script descarga y limpia los conjuntos de datos
 relevantes para el proyecto desde la página de Banxico.
 """
 
+import argparse
+import os
+import tracemalloc
+from array import array
 from datetime import datetime
+from functools import partial
+from io import BytesIO
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+
+from almacen import RUTA_ALMACEN, TABLAS, generar_almacen
+from cambios import calcular_cambios, registrar_cambios
+from catalogos import ABREVIACIONES_USA, ENTIDADES, ENTIDADES_INVERSO, PAISES
+from conexiones import MAX_POR_SERVIDOR
+from datos import calcular_agregado, calcular_deflactores, cargar, ruta_parquet
+from descargas import MAX_HILOS, TTL_CACHE, descargar_cuadros, redirigir_urls
+from esquemas import AGREGADOS, DEFLACTORES, ESQUEMAS, aplicar_esquema
+from grafo import MAX_ETAPAS, ejecutar_grafo
+from instrumentacion import guardar_reporte, imprimir_tabla, medir, resumen
+from pib import CARPETA_PIB, RUTA_PIB, generar_matrices
+from puntos_control import archivo_temporal, leer_con_punto_control
+from validacion import validar
 
 # EStos timestamps son utilizados para formar las URLS.
 ENERO_1982 = int(datetime(1982, 1, 1).timestamp() * 1000)
@@ -25,6 +46,34 @@ REMESAS_PAIS_DESTINO_URL = "https://www.banxico.org.mx/SieInternet/consultarDire
 REMESAS_MUNICIPIO_URL = "https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?sector=1&accion=consultarCuadro&idCuadro=CE166&locale=es&formatoXLS.x=1&fechaInicio={}&fechaFin={}"
 REMESAS_USA_URL = "https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?sector=1&accion=consultarCuadro&idCuadro=CE168&locale=es&formatoXLS.x=1&fechaInicio={}&fechaFin={}"
 
+# Cada cuadro del SIE con su URL y la fecha desde la cual se descarga.
+# Antes de 1982 solo se encuentra disponible el INPC general.
+CUADROS = {
+    "CP154": (IPC_URL, ENERO_1982),
+    "CF86": (TIPO_CAMBIO_URL, ENERO_1991),
+    "CE81": (REMESAS_MENSUALES_INGRESOS_URL, ENERO_1991),
+    "CE165": (REMESAS_MENSUALES_EGREOS_URL, ENERO_1991),
+    "CE100": (REMESAS_ENTIDAD_URL, ENERO_1991),
+    "CE167": (REMESAS_PAIS_ORIGEN_URL, ENERO_1991),
+    "CE169": (REMESAS_PAIS_DESTINO_URL, ENERO_1991),
+    "CE166": (REMESAS_MUNICIPIO_URL, ENERO_1991),
+    "CE168": (REMESAS_USA_URL, ENERO_1991),
+}
+
+# El conjunto de datos que genera cada cuadro y el número de meses que se
+# vuelven a descargar en modo incremental para incorporar las revisiones de Banxico.
+SALIDAS = {
+    "CP154": ("IPC", 3),
+    "CF86": ("USDMXN", 3),
+    "CE81": ("remesas_mensuales", 6),
+    "CE165": ("remesas_mensuales", 6),
+    "CE100": ("remesas_entidad", 12),
+    "CE167": ("remesas_pais", 12),
+    "CE169": ("remesas_pais", 12),
+    "CE166": ("remesas_municipio", 12),
+    "CE168": ("remesas_usa", 12),
+}
+
 MESES = {
     "Ene": "01",
     "Feb": "02",
@@ -42,338 +91,534 @@ MESES = {
 
 TRIMESTRES = {"Ene-Mar": "01", "Abr-Jun": "04", "Jul-Sep": "07", "Oct-Dic": "10"}
 
+# Versión de las funciones interpretar_cuadro*(). Se debe incrementar al
+# cambiar su resultado para descartar los puntos de control anteriores.
+VERSION_INTERPRETACION = 1
 
-ENTIDADES = {
-    1: "Aguascalientes",
-    2: "Baja California",
-    3: "Baja California Sur",
-    4: "Campeche",
-    5: "Coahuila",
-    6: "Colima",
-    7: "Chiapas",
-    8: "Chihuahua",
-    9: "Ciudad de México",
-    10: "Durango",
-    11: "Guanajuato",
-    12: "Guerrero",
-    13: "Hidalgo",
-    14: "Jalisco",
-    15: "Estado de México",
-    16: "Michoacán",
-    17: "Morelos",
-    18: "Nayarit",
-    19: "Nuevo León",
-    20: "Oaxaca",
-    21: "Puebla",
-    22: "Querétaro",
-    23: "Quintana Roo",
-    24: "San Luis Potosí",
-    25: "Sinaloa",
-    26: "Sonora",
-    27: "Tabasco",
-    28: "Tamaulipas",
-    29: "Tlaxcala",
-    30: "Veracruz",
-    31: "Yucatán",
-    32: "Zacatecas",
-}
 
-ENTIDADES_INVERSO = {v: k for k, v in ENTIDADES.items()}
-
-
-PAISES = {
-    "Afganistán": "AFG",
-    "Albania": "ALB",
-    "Alemania": "DEU",
-    "Angola": "AGO",
-    "Anguila": "AIA",
-    "Antigua y Barbuda": "ATG",
-    "Antillas Holandesas": "ANT",
-    "Arabia Saudita": "SAU",
-    "Argelia": "DZA",
-    "Argentina": "ARG",
-    "Armenia": "ARM",
-    "Aruba": "ABW",
-    "Australia": "AUS",
-    "Austria": "AUT",
-    "Azerbaiyán": "AZE",
-    "Bahamas": "BHS",
-    "Bahrein": "BHR",
-    "Bangladesh": "BGD",
-    "Barbados": "BRB",
-    "Bélgica": "BEL",
-    "Belice": "BLZ",
-    "Benín": "BEN",
-    "Bermudas": "BMU",
-    "Bielorrusia": "BLR",
-    "Bolivia": "BOL",
-    "Bonaire": "BES",
-    "Bosnia-Herzegovina": "BIH",
-    "Botswana": "BWA",
-    "Brasil": "BRA",
-    "Brunei": "BRN",
-    "Bulgaria": "BGR",
-    "Burkina Faso": "BFA",
-    "Burundi": "BDI",
-    "Bután": "BTN",
-    "Cabo Verde": "CPV",
-    "Camboya": "KHM",
-    "Camerún": "CMR",
-    "Canadá": "CAN",
-    "Chad": "TCD",
-    "Chile": "CHL",
-    "China": "CHN",
-    "Chipre": "CYP",
-    "Cisjordania": "PSE",
-    "Colombia": "COL",
-    "Comores": "COM",
-    "Corea del Norte": "PRK",
-    "Corea del Sur": "KOR",
-    "Costa de Marfil": "CIV",
-    "Costa Rica": "CRI",
-    "Croacia": "HRV",
-    "Cuba": "CUB",
-    "Curazao": "CUW",
-    "Dinamarca": "DNK",
-    "Djibouti": "DJI",
-    "Dominica": "DMA",
-    "Ecuador": "ECU",
-    "Egipto": "EGY",
-    "El Salvador": "SLV",
-    "Emiratos Árabes Unidos": "ARE",
-    "Eslovaquia": "SVK",
-    "Eslovenia": "SVN",
-    "España": "ESP",
-    "Estados Unidos": "USA",
-    "Estonia": "EST",
-    "Etiopía": "ETH",
-    "Federación Rusa": "RUS",
-    "Filipinas": "PHL",
-    "Finlandia": "FIN",
-    "Fiyi": "FJI",
-    "Francia": "FRA",
-    "Gabón": "GAB",
-    "Gambia": "GMB",
-    "Georgia": "GEO",
-    "Ghana": "GHA",
-    "Gibraltar": "GIB",
-    "Granada": "GRD",
-    "Grecia": "GRC",
-    "Guadalupe": "GLP",
-    "Guam": "GUM",
-    "Guatemala": "GTM",
-    "Guayana Francesa": "GUF",
-    "Guinea Bisáu": "GNB",
-    "Guinea Ecuatorial": "GNQ",
-    "Guyana": "GUY",
-    "Haití": "HTI",
-    "Honduras": "HND",
-    "Hong Kong": "HKG",
-    "Hungría": "HUN",
-    "India": "IND",
-    "Indonesia": "IDN",
-    "Iraq": "IRQ",
-    "Irlanda": "IRL",
-    "Isla de San Martín": "SXM",
-    "Islandia": "ISL",
-    "Islas Caimán": "CYM",
-    "Islas Cocos": "CCK",
-    "Islas Cook": "COK",
-    "Islas Marshall": "MHL",
-    "Islas Salomón": "SLB",
-    "Islas Turcas y Caicos": "TCA",
-    "Islas Virgenes Americanas": "VIR",
-    "Islas Virgenes Británicas": "VGB",
-    "Israel": "ISR",
-    "Italia": "ITA",
-    "Jamaica": "JAM",
-    "Japón": "JPN",
-    "Jordania": "JOR",
-    "Kazajistán": "KAZ",
-    "Kenia": "KEN",
-    "Kirguistán": "KGZ",
-    "Kiribati": "KIR",
-    "Kosovo": "XKX",
-    "Kuwait": "KWT",
-    "Laos": "LAO",
-    "Letonia": "LVA",
-    "Líbano": "LBN",
-    "Liberia": "LBR",
-    "Libia": "LBY",
-    "Liechtenstein": "LIE",
-    "Lituania": "LTU",
-    "Luxemburgo": "LUX",
-    "Macao": "MAC",
-    "Macedonia": "MKD",
-    "Madagascar": "MDG",
-    "Malasia": "MYS",
-    "Malawi": "MWI",
-    "Maldivas": "MDV",
-    "Malí": "MLI",
-    "Malta": "MLT",
-    "Marianas del Norte": "MNP",
-    "Marruecos": "MAR",
-    "Martinica": "MTQ",
-    "Mauricio": "MUS",
-    "Mauritania": "MRT",
-    "Moldavia": "MDA",
-    "Mónaco": "MCO",
-    "Mongolia": "MNG",
-    "Montenegro": "MNE",
-    "Montserrat": "MSR",
-    "Mozambique": "MOZ",
-    "Myanmar, Birmania": "MMR",
-    "Namibia": "NAM",
-    "Nepal": "NPL",
-    "Nicaragua": "NIC",
-    "Niger": "NER",
-    "Nigeria": "NGA",
-    "Niue": "NIU",
-    "Noruega": "NOR",
-    "Nueva Caledonia": "NCL",
-    "Nueva Zelanda": "NZL",
-    "Omán": "OMN",
-    "Países Bajos": "NLD",
-    "Pakistán": "PAK",
-    "Palaos": "PLW",
-    "Palestina": "PSE",
-    "Panamá": "PAN",
-    "Papúa-Nueva Guinea": "PNG",
-    "Paraguay": "PRY",
-    "Perú": "PER",
-    "Polinesia Francesa": "PYF",
-    "Polonia": "POL",
-    "Portugal": "PRT",
-    "Qatar": "QAT",
-    "Reino de Lesoto": "LSO",
-    "Reino Unido": "GBR",
-    "República Centroafricana": "CAF",
-    "República Checa": "CZE",
-    "República de Abjasia": "ABK",
-    "República del Congo": "COG",
-    "República Democrática del Congo": "COD",
-    "República Dominicana": "DOM",
-    "República Guinea": "GIN",
-    "Reunión": "REU",
-    "Ruanda": "RWA",
-    "Rumanía": "ROU",
-    "Samoa": "WSM",
-    "San Cristobal y Nevis": "KNA",
-    "San Marino": "SMR",
-    "San Vincente y Granadinas": "VCT",
-    "Santa Lucía": "LCA",
-    "Santo Tomé y Príncipe": "STP",
-    "Senegal": "SEN",
-    "Serbia": "SRB",
-    "Sierra Leona": "SLE",
-    "Singapur": "SGP",
-    "Siria": "SYR",
-    "Sri Lanka": "LKA",
-    "Sudáfrica": "ZAF",
-    "Sudán": "SDN",
-    "Suecia": "SWE",
-    "Suiza": "CHE",
-    "Surinam": "SUR",
-    "Swazilandia": "SWZ",
-    "Tailandia": "THA",
-    "Taiwan": "TWN",
-    "Tanzania": "TZA",
-    "Tayikistán": "TJK",
-    "Timor Oriental": "TLS",
-    "Togo": "TGO",
-    "Trinidad y Tobago": "TTO",
-    "Túnez": "TUN",
-    "Turkmenistán": "TKM",
-    "Turquía": "TUR",
-    "Tuvalu": "TUV",
-    "Ucrania": "UKR",
-    "Uganda": "UGA",
-    "Uruguay": "URY",
-    "Uzbekistán": "UZB",
-    "Vanuatu": "VUT",
-    "Venezuela": "VEN",
-    "Vietnam": "VNM",
-    "Yemen": "YEM",
-    "Zambia": "ZMB",
-    "Zimbabwe": "ZWE",
-    "No Identificado": "XXX",
+# Nombres alternativos de algunas entidades en los cuadros de Banxico.
+ALIAS_ENTIDADES = {
+    "México": "Estado de México",
+    "Distrito Federal": "Ciudad de México",
+    "Coahuila de Zaragoza": "Coahuila",
+    "Michoacán de Ocampo": "Michoacán",
+    "Veracruz de Ignacio de la Llave": "Veracruz",
 }
 
+# Banxico reporta Cisjordania y Palestina por separado, pero ambas tienen
+# la clave PSE. Sumamos sus cifras bajo un solo nombre para que cada
+# clave tenga un solo registro por periodo.
+ALIAS_PAISES = {"Cisjordania": "Palestina"}
+
+# Nombres alternativos de municipios que difieren del catálogo del CONAPO.
+# La llave es una tupla (entidad, municipio según Banxico) y el valor
+# es el nombre del municipio en assets/poblacion.csv.
+ALIAS_MUNICIPIOS = dict()
+
+
+def arreglar_periodo(etiqueta):
+    """
+    Convierte una etiqueta de periodo del SIE a fecha ISO.
+
+    Parameters
+    ----------
+    etiqueta : str
+        Una etiqueta mensual ('Ene 2024') o trimestral ('Abr-Jun 2024').
+
+    Returns
+    -------
+    str
+        La fecha ISO del primer día del periodo.
+
+    """
+
+    prefijo, año = etiqueta.split()
+    mes = MESES[prefijo] if prefijo in MESES else TRIMESTRES[prefijo]
+    return f"{año}-{mes}-01"
+
+
+def convertir_periodos(etiquetas):
+    """
+    Convierte las etiquetas de periodo del SIE a fechas.
+
+    Cada etiqueta distinta se convierte una sola vez,
+    sin importar cuántas veces se repita.
+
+    Parameters
+    ----------
+    etiquetas : array-like
+        Las etiquetas mensuales o trimestrales.
+
+    Returns
+    -------
+    pandas.DatetimeIndex
+        La fecha del primer día de cada periodo.
+
+    """
+
+    codigos, unicas = pd.factorize(np.asarray(etiquetas))
+
+    fechas = pd.to_datetime([arreglar_periodo(x) for x in unicas], format="%Y-%m-%d")
+
+    return pd.DatetimeIndex(fechas.take(codigos), name="PERIODO")
+
+
+def calcular_fecha_inicio(cuadro, incremental):
+    """
+    Calcula el timestamp desde el cual se descargará un cuadro.
+
+    En modo incremental se parte del periodo más reciente que ya
+    existe en el archivo de salida, menos algunos meses para
+    incorporar las revisiones de los periodos anteriores.
+
+    Parameters
+    ----------
+    cuadro : str
+        El ID del cuadro.
+
+    incremental : bool
+        Si es True, solo se descargarán los periodos recientes.
+
+    Returns
+    -------
+    int
+        El timestamp en milisegundos usado en la URL del SIE.
+
+    """
+
+    fecha_inicio = CUADROS[cuadro][1]
+    nombre, meses_revision = SALIDAS[cuadro]
+    ruta = ESQUEMAS[nombre]["ruta"]
+
+    # Si no hay archivo previo, descargamos el historial completo.
+    if not incremental or not os.path.exists(ruta):
+        return fecha_inicio
+
+    # Solo necesitamos la columna del periodo.
+    periodos = pd.read_csv(ruta, usecols=["PERIODO"], parse_dates=["PERIODO"])
+
+    # Retrocedemos los meses de revisión desde el periodo más reciente.
+    ultimo_periodo = periodos["PERIODO"].max() - pd.DateOffset(months=meses_revision)
+    ultimo_periodo = int(ultimo_periodo.to_pydatetime().timestamp() * 1000)
+
+    return max(fecha_inicio, ultimo_periodo)
+
+
+def construir_urls(incremental=False):
+    """
+    Construye la URL de descarga de cada cuadro.
+
+    Parameters
+    ----------
+    incremental : bool
+        Si es True, solo se descargarán los periodos recientes.
+
+    Returns
+    -------
+    dict
+        Diccionario con el ID del cuadro como llave y su URL como valor.
+
+    """
+
+    return {
+        cuadro: url.format(calcular_fecha_inicio(cuadro, incremental), FECHA_FIN)
+        for cuadro, (url, _) in CUADROS.items()
+    }
+
+
+def guardar(df, nombre, incremental=False):
+    """
+    Guarda un conjunto de datos en formato CSV y Parquet.
+
+    Antes de escribir, el DataFrame completo se valida con validacion.py.
+    Las columnas se ordenan y convierten a los tipos definidos en su
+    esquema y los registros se ordenan por sus llaves. La versión Parquet
+    conserva los tipos de datos para que las cargas posteriores no tengan
+    que volver a interpretar el texto.
+
+    En modo incremental se conservan los registros del archivo existente
+    anteriores al primer periodo del nuevo DataFrame y se reemplazan
+    todos los demás, esto incluye los periodos revisados y los nuevos.
+
+    Si el archivo ya existía, los registros agregados, eliminados y
+    revisados respecto a la versión anterior se registran con cambios.py.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El DataFrame que se desea guardar.
+
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    incremental : bool
+        Si es True, el DataFrame se une con el archivo existente.
+
+    """
+
+    esquema = ESQUEMAS[nombre]
+    ruta = esquema["ruta"]
+
+    anterior = cargar(nombre) if os.path.exists(ruta) else None
+
+    if incremental and anterior is not None:
+        # Quitamos los periodos que serán reemplazados y unimos ambos DataFrames.
+        conservados = anterior[anterior["PERIODO"] < df["PERIODO"].min()]
+        df = pd.concat([conservados, df])
+
+    # Validamos antes de asignar los tipos, ya que los valores que no
+    # existen en las categorías del esquema se convertirían en nulos.
+    validar(df, nombre)
+
+    df = aplicar_esquema(df, nombre).sort_values(esquema["llaves"], ignore_index=True)
+
+    if anterior is not None:
+        cambios = calcular_cambios(anterior, df, nombre)
+
+    # Cada archivo se escribe en un temporal y después se reemplaza, así
+    # los scripts nunca leen un archivo a medias.
+    with medir("escritura") as medicion:
+        with archivo_temporal(ruta) as temporal:
+            df.to_csv(temporal, index=False, encoding="utf-8")
+
+        # El Parquet se escribe después del CSV para que nunca parezca más antiguo.
+        with archivo_temporal(ruta_parquet(ruta)) as temporal:
+            df.to_parquet(temporal, index=False)
+
+        medicion["filas"] = len(df)
+        medicion["bytes_salida"] = os.path.getsize(ruta)
+
+        # Los cambios solo se registran una vez que el archivo fue reemplazado.
+        if anterior is not None and len(cambios):
+            registrar_cambios(cambios, nombre)
+
+
+def interpretar_cuadro(contenido):
+    """
+    Interpreta el contenido crudo de un cuadro del SIE.
+
+    Parameters
+    ----------
+    contenido : bytes
+        El contenido crudo del cuadro.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El cuadro sin las filas de encabezado.
+
+    """
+
+    return pd.read_excel(BytesIO(contenido), skiprows=9, index_col=1)
+
+
+def interpretar_cuadro_municipios(contenido):
+    """
+    Interpreta el contenido crudo de un cuadro municipal del SIE fila por fila.
+
+    A diferencia de interpretar_cuadro(), el libro se abre en modo de solo
+    lectura y las filas se recorren una sola vez. Las filas con ● son estados
+    y las filas con ⚬ son municipios. Las cifras de cada municipio se agregan
+    directamente a un arreglo numérico, sin crear un DataFrame con todas
+    las celdas del cuadro.
+
+    Parameters
+    ----------
+    contenido : bytes
+        El contenido crudo del cuadro.
+
+    Returns
+    -------
+    tuple
+        Las etiquetas de los periodos, los nombres de los municipios,
+        el nombre de la entidad de cada municipio y un arreglo con
+        una fila por municipio y una columna por periodo.
+
+    """
+
+    libro = load_workbook(BytesIO(contenido), read_only=True, data_only=True)
+
+    try:
+        hoja = libro.worksheets[0]
+
+        # El encabezado con los periodos está en la fila 10, a partir de la columna C.
+        encabezado = next(hoja.iter_rows(min_row=10, max_row=10, values_only=True))
+        periodos = [periodo for periodo in encabezado[2:] if periodo is not None]
+        ultima_columna = len(periodos) + 2
+
+        municipios = list()
+        entidades = list()
+        valores = array("d")
+        entidad = None
+
+        for fila in hoja.iter_rows(
+            min_row=11, min_col=2, max_col=ultima_columna, values_only=True
+        ):
+            etiqueta = fila[0]
+
+            if not isinstance(etiqueta, str):
+                continue
+
+            if "●" in etiqueta:
+                entidad = etiqueta[2:].strip()
+            elif "⚬" in etiqueta:
+                municipios.append(etiqueta[3:].strip())
+                entidades.append(entidad)
+                valores.extend(np.nan if valor is None else valor for valor in fila[1:])
+    finally:
+        libro.close()
+
+    valores = np.frombuffer(valores, dtype=float).reshape(
+        len(municipios), len(periodos)
+    )
+
+    return periodos, municipios, entidades, valores
+
+
+def leer_cuadro(archivos, cuadro, interpretar=interpretar_cuadro):
+    """
+    Lee un cuadro del SIE previamente descargado.
+
+    Si el mismo contenido ya fue interpretado en una ejecución
+    anterior, se recupera de su punto de control.
+
+    Parameters
+    ----------
+    archivos : dict
+        Diccionario con el contenido crudo de cada cuadro.
+
+    cuadro : str
+        El ID del cuadro que se desea leer.
+
+    interpretar : callable
+        La función que interpreta el contenido crudo del cuadro.
+
+    Returns
+    -------
+    pandas.DataFrame | tuple
+        El resultado de la función interpretar.
+
+    """
+
+    with medir("lectura"):
+        return leer_con_punto_control(
+            cuadro, archivos[cuadro], interpretar, VERSION_INTERPRETACION
+        )
+
+
+def mapear(nombres, catalogo):
+    """
+    Asigna a cada nombre su clave de acuerdo a un catálogo.
+
+    Parameters
+    ----------
+    nombres : pandas.Index
+        Los nombres de las entidades, países o estados.
+
+    catalogo : dict | pandas.Series
+        El catálogo con los nombres como llave y las claves como valor.
+
+    Returns
+    -------
+    pandas.Index
+        La clave de cada nombre.
+
+    Raises
+    ------
+    KeyError
+        Si algún nombre no se encuentra en el catálogo.
+        El mensaje incluye todos los nombres faltantes.
+
+    """
+
+    claves = nombres.map(catalogo)
+
+    faltantes = nombres[claves.isna()]
+
+    if len(faltantes):
+        raise KeyError(f"Nombres no encontrados en el catálogo: {list(faltantes)}")
+
+    return claves
+
+
+def convertir_a_largo(df, columnas, cuadro):
+    """
+    Convierte un cuadro en formato ancho a formato largo.
+
+    El cuadro debe tener los periodos como índice y una columna por cada
+    entidad, país, municipio o estado. Todos los valores se acomodan en una
+    sola columna sin crear un DataFrame por cada columna del cuadro.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El cuadro en formato ancho con cifras en millones de dólares.
+
+    columnas : dict
+        Diccionario con el nombre de cada columna descriptiva del resultado
+        como llave y como valor una secuencia con un elemento por cada
+        columna de df, o un escalar que se repite en todas las filas.
+
+    cuadro : str
+        El ID del cuadro, para identificarlo en los mensajes de error.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El DataFrame en formato largo con las columnas PERIODO,
+        las columnas descriptivas y VALOR_USD (en dólares).
+
+    Raises
+    ------
+    ValueError
+        Si el cuadro tiene celdas vacías. El mensaje incluye la columna
+        y el periodo de cada una.
+
+    """
+
+    num_periodos, num_columnas = df.shape
+
+    # Los valores de cada columna quedan uno detrás de otro.
+    final = {"PERIODO": np.tile(df.index.to_numpy(), num_columnas)}
+
+    for nombre, valores in columnas.items():
+        if np.ndim(valores) == 0:
+            final[nombre] = np.full(num_periodos * num_columnas, valores)
+        else:
+            final[nombre] = np.repeat(np.asarray(valores), num_periodos)
+
+    # Convertimos las cifras de millones de dólares a dólares.
+    valores = df.to_numpy(dtype=float).ravel(order="F") * 1000000
+
+    # NumPy convierte los nulos en enteros negativos sin avisar,
+    # por lo que las celdas vacías se reportan antes de convertir.
+    vacias = np.isnan(valores)
+
+    if vacias.any():
+        celdas = [
+            f"{df.columns[i // num_periodos]} ({df.index[i % num_periodos]:%Y-%m})"
+            for i in np.flatnonzero(vacias)
+        ]
+        raise ValueError(f"El cuadro {cuadro} tiene celdas vacías: {celdas}")
+
+    final["VALOR_USD"] = valores.astype(int)
+
+    return pd.DataFrame(final)
+
+
+def normalizar_nombres(nombres):
+    """
+    Normaliza nombres geográficos para poder compararlos.
+
+    Se quitan acentos, mayúsculas y espacios repetidos.
+
+    Parameters
+    ----------
+    nombres : pandas.Series
+        Los nombres que se desean normalizar.
+
+    Returns
+    -------
+    pandas.Series
+        Los nombres normalizados.
+
+    """
+
+    return (
+        nombres.str.normalize("NFKD")
+        .str.encode("ascii", errors="ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.split()
+        .str.join(" ")
+    )
 
-ABREVIACIONES_USA = {
-    "Alabama": "AL",
-    "Alaska": "AK",
-    "Arizona": "AZ",
-    "Arkansas": "AR",
-    "California": "CA",
-    "Colorado": "CO",
-    "Connecticut": "CT",
-    "Delaware": "DE",
-    "Florida": "FL",
-    "Georgia": "GA",
-    "Hawaii": "HI",
-    "Idaho": "ID",
-    "Illinois": "IL",
-    "Indiana": "IN",
-    "Iowa": "IA",
-    "Kansas": "KS",
-    "Kentucky": "KY",
-    "Luisiana": "LA",
-    "Maine": "ME",
-    "Maryland": "MD",
-    "Massachusetts": "MA",
-    "Michigan": "MI",
-    "Minnesota": "MN",
-    "Mississipi": "MS",
-    "Misuri": "MO",
-    "Montana": "MT",
-    "Nebraska": "NE",
-    "Nevada": "NV",
-    "Nuevo Hampshire": "NH",
-    "Nueva Jersey": "NJ",
-    "Nuevo Mexico": "NM",
-    "Nueva York": "NY",
-    "Carolina Del Norte": "NC",
-    "Dakota Del Norte": "ND",
-    "Ohio": "OH",
-    "Oklahoma": "OK",
-    "Oregon": "OR",
-    "Pensilvania": "PA",
-    "Puerto Rico": "PR",
-    "Rhode Island": "RI",
-    "Carolina Del Sur": "SC",
-    "Dakota Del Sur": "SD",
-    "Tennessee": "TN",
-    "Texas": "TX",
-    "Utah": "UT",
-    "Vermont": "VT",
-    "Virginia": "VA",
-    "Washington": "WA",
-    "Washington, D.C.": "DC",
-    "West Virginia": "WV",
-    "Wisconsin": "WI",
-    "Wyoming": "WY",
-    "No Identificado": "XX",
-}
 
+def resolver_municipios(municipios, entidades):
+    """
+    Obtiene la clave de cada municipio a partir de su nombre y entidad.
+
+    Los nombres se normalizan una sola vez y todos los municipios se
+    resuelven con un solo join contra assets/poblacion.csv.
 
-def arreglar_fecha(x):
-    mes, año = x.split()
-    return f"{año}-{MESES[mes]}-01"
+    Parameters
+    ----------
+    municipios : pandas.Series
+        Los nombres de los municipios según Banxico.
 
+    entidades : pandas.Series
+        Los nombres de las entidades de cada municipio según Banxico.
 
-def arreglar_fecha_trimestre(x):
-    trimestre, año = x.split()
-    return f"{año}-{TRIMESTRES[trimestre]}-01"
+    Returns
+    -------
+    pandas.DataFrame
+        Un DataFrame con las columnas CVE, Entidad y Municipio en el mismo
+        orden que los municipios recibidos. Los nombres son los del catálogo.
 
+    Raises
+    ------
+    KeyError
+        Si algún municipio no se encuentra en el catálogo.
+        El mensaje incluye todos los municipios faltantes.
 
-def descargar_ipc():
+    """
+
+    # Cargamos el catálogo de municipios (solo las primeras 3 columnas).
+    catalogo = pd.read_csv("./assets/poblacion.csv", dtype={"CVE": str})
+    catalogo = catalogo.iloc[:, :3]
+
+    # Agregamos un municipio no identificado para cada entidad.
+    no_identificados = pd.DataFrame(
+        {
+            "CVE": [f"{k:02}999" for k in ENTIDADES],
+            "Entidad": list(ENTIDADES.values()),
+            "Municipio": "No identificado",
+        }
+    )
+
+    catalogo = pd.concat([catalogo, no_identificados], ignore_index=True)
+
+    catalogo["llave_entidad"] = normalizar_nombres(catalogo["Entidad"])
+    catalogo["llave_municipio"] = normalizar_nombres(catalogo["Municipio"])
+
+    # Aplicamos los alias conocidos antes de normalizar los nombres de Banxico.
+    entidades = entidades.replace(ALIAS_ENTIDADES).reset_index(drop=True)
+    municipios = pd.Series(
+        [
+            ALIAS_MUNICIPIOS.get((entidad, municipio), municipio)
+            for entidad, municipio in zip(entidades, municipios)
+        ]
+    )
+
+    buscados = pd.DataFrame(
+        {
+            "nombre": municipios + ", " + entidades,
+            "llave_entidad": normalizar_nombres(entidades),
+            "llave_municipio": normalizar_nombres(municipios),
+        }
+    )
+
+    resultado = buscados.merge(
+        catalogo,
+        on=["llave_entidad", "llave_municipio"],
+        how="left",
+        validate="many_to_one",
+    )
+
+    faltantes = resultado.loc[resultado["CVE"].isna(), "nombre"]
+
+    if len(faltantes):
+        raise KeyError(f"Municipios no encontrados en el catálogo: {list(faltantes)}")
+
+    return resultado[["CVE", "Entidad", "Municipio"]]
+
+
+def descargar_ipc(archivos, incremental=False):
     """
     Descarga el índice de precios al consumidor.
     """
 
-    # Antes de 1982 solo se encuentra disponible el INPC general.
-    df = pd.read_excel(IPC_URL.format(ENERO_1982, FECHA_FIN), skiprows=9, index_col=1)
+    df = leer_cuadro(archivos, "CP154")
 
     # Seleccionamos las filas del INPC general, subyacente y no subyacente.
     df = df.iloc[[1, 2, 13]].transpose()
@@ -384,55 +629,45 @@ def descargar_ipc():
     # Quitamos filas inválidas.
     df = df.dropna(axis=0)
 
-    # Convertimos el índice a formato ISO.
-    df.index = df.index.map(arreglar_fecha)
-    df.index.name = "PERIODO"
+    # Convertimos el índice a fechas.
+    df.index = convertir_periodos(df.index)
 
     # Guardamos el archivo en la carpeta assets.
-    df.to_csv("./assets/IPC.csv", encoding="utf-8")
+    guardar(df.reset_index(), "IPC", incremental)
 
 
-def descargar_tipo_cambio():
+def descargar_tipo_cambio(archivos, incremental=False):
     """
     Descarga el tipo de cambio USDMXN.
     """
 
-    df = pd.read_excel(
-        TIPO_CAMBIO_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
+    df = leer_cuadro(archivos, "CF86")
 
     # Seleccionamos la fila del tipo de cambio FIX.
     df = df.iloc[3].to_frame("TIPO_CAMBIO")
 
-    # Quitamos filas inválidas.
+    # Quitamos filas inválidas. Antes de noviembre de 1991
+    # el cuadro reporta el tipo de cambio FIX en cero.
     df = df.dropna(axis=0)
+    df = df[df["TIPO_CAMBIO"] > 0]
 
-    # Convertimos el índice a formato ISO.
-    df.index = df.index.map(arreglar_fecha)
-    df.index.name = "PERIODO"
+    # Convertimos el índice a fechas.
+    df.index = convertir_periodos(df.index)
 
     # Guardamos el archivo en la carpeta assets.
-    df.to_csv("./assets/USDMXN.csv", encoding="utf-8")
+    guardar(df.reset_index(), "USDMXN", incremental)
 
 
-def descargar_remesas_mensuales():
+def descargar_remesas_mensuales(archivos, incremental=False):
     """
     Descarga los ingresos y egresos mensuales por remesas.
     """
 
     # Cargamos el EXcel de los ingresos mensuales de remesas.
-    df1 = pd.read_excel(
-        REMESAS_MENSUALES_INGRESOS_URL.format(ENERO_1991, FECHA_FIN),
-        skiprows=9,
-        index_col=1,
-    )
+    df1 = leer_cuadro(archivos, "CE81")
 
     # Cargamos el Excel de los egresos mensuales de remesas.
-    df2 = pd.read_excel(
-        REMESAS_MENSUALES_EGREOS_URL.format(ENERO_1991, FECHA_FIN),
-        skiprows=9,
-        index_col=1,
-    )
+    df2 = leer_cuadro(archivos, "CE165")
 
     # Seleccionamos las filas del remesas y operaciones.
     df1 = df1.iloc[[2, 7]].transpose()
@@ -446,6 +681,10 @@ def descargar_remesas_mensuales():
     df1 = df1.dropna(axis=0)
     df2 = df2.dropna(axis=0)
 
+    # Convertimos el índice a fechas.
+    df1.index = convertir_periodos(df1.index)
+    df2.index = convertir_periodos(df2.index)
+
     # Agregamos la dirección del flujo.
     df1["ID_FLUJO"] = 1
     df1["FLUJO"] = "Ingresos"
@@ -463,284 +702,421 @@ def descargar_remesas_mensuales():
     final["OPERACIONES"] = final["OPERACIONES"].astype(float) * 1000
     final["OPERACIONES"] = final["OPERACIONES"].astype(int)
 
-    # Reseteamos el índice y lo convertimos a fecha ISO.
-    final.reset_index(names=["PERIODO"], inplace=True)
-    final["PERIODO"] = final["PERIODO"].apply(arreglar_fecha)
-
-    # Ordenamos las columnas.
-    final = final[["PERIODO", "ID_FLUJO", "FLUJO", "OPERACIONES", "VALOR_USD"]]
-
-    # Ordenamos todo el DataFrame.
-    final.sort_values(list(final.columns), inplace=True)
+    # Reseteamos el índice.
+    final.reset_index(inplace=True)
 
     # Guardamos el archivo en la carpeta data.
-    final.to_csv("./data/remesas_mensuales.csv", index=False, encoding="utf-8")
+    guardar(final, "remesas_mensuales", incremental)
 
 
-def descargar_remesas_entidad():
+def descargar_remesas_entidad(archivos, incremental=False):
     """
     Descarga los ingresos trimestrales por remesas
     según entidad de destino.
     """
 
-    df = pd.read_excel(
-        REMESAS_ENTIDAD_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
-
-    dfs = list()
+    df = leer_cuadro(archivos, "CE100")
 
     # Seleccionamos las filas y columnas necesarias.
     df = df.iloc[2:34, 1:].transpose()
 
-    # Iteramos sobre cada entidad.
-    for entidad in df.columns:
-        nombre_entidad = entidad[3:].strip()
-
-        # Creamos un DataFrame temporal y llenamos los valores necesarios.
-        temp_df = df[entidad].to_frame("VALOR_USD")
-        temp_df["CVE_ENT"] = ENTIDADES_INVERSO[nombre_entidad]
-        temp_df["ENTIDAD"] = nombre_entidad
-
-        dfs.append(temp_df)
-
-    # Unimos los DataFrames de cada entidad en uno solo.
-    final = pd.concat(dfs)
+    # Convertimos los periodos a fechas antes de cambiar el formato.
+    df.index = convertir_periodos(df.index)
 
-    # Reseteamos el índice.
-    final.reset_index(names=["PERIODO"], inplace=True)
-
-    # Arregalmos algunas columnas.
-    final["PERIODO"] = final["PERIODO"].apply(arreglar_fecha_trimestre)
-    final["VALOR_USD"] = final["VALOR_USD"].astype(float) * 1000000
-    final["VALOR_USD"] = final["VALOR_USD"].astype(int)
+    # Quitamos la clave que antecede al nombre de cada entidad.
+    nombres = df.columns.str[3:].str.strip()
 
-    # Ordenamos las columnas.
-    final = final[["PERIODO", "CVE_ENT", "ENTIDAD", "VALOR_USD"]]
-
-    # Ordenamos todo el DataFrame.
-    final.sort_values(list(final.columns), inplace=True)
+    # Convertimos el cuadro a formato largo.
+    final = convertir_a_largo(
+        df,
+        {"CVE_ENT": mapear(nombres, ENTIDADES_INVERSO), "ENTIDAD": nombres},
+        "CE100",
+    )
 
     # Guardamos el archivo en la carpeta data.
-    final.to_csv("./data/remesas_entidad.csv", index=False, encoding="utf-8")
+    guardar(final, "remesas_entidad", incremental)
 
 
-def descargar_remesas_pais():
+def descargar_remesas_pais(archivos, incremental=False):
     """
     Descarga los ingresos trimestrales por remesas
     según entidad de destino.
     """
 
     # Cargamos el archivo Excel del origen de las remesas por país.
-    df1 = pd.read_excel(
-        REMESAS_PAIS_ORIGEN_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
+    df1 = leer_cuadro(archivos, "CE167")
 
     # Cargamos el archivo Excel del destino de las remesas por país.
-    df2 = pd.read_excel(
-        REMESAS_PAIS_DESTINO_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
-
-    dfs = list()
+    df2 = leer_cuadro(archivos, "CE169")
 
     # Seleccionamos las filas y columnas necesarias.
     df1 = df1.iloc[2:-2, 1:].transpose()
     df2 = df2.iloc[2:-2, 1:].transpose()
 
-    # Iteramos sobre cada país.
-    for pais in df1.columns:
-        nombre_pais = pais[3:].strip()
+    # Convertimos los periodos a fechas antes de cambiar el formato.
+    df1.index = convertir_periodos(df1.index)
+    df2.index = convertir_periodos(df2.index)
 
-        # Creamos un DataFrame temporal y llenamos los valores necesarios.
-        temp_df = df1[pais].to_frame("VALOR_USD")
-        temp_df["ID_PAIS"] = PAISES[nombre_pais]
-        temp_df["PAIS"] = nombre_pais
-        temp_df["ID_FLUJO"] = 1
-        temp_df["FLUJO"] = "Ingresos"
+    dfs = list()
 
-        dfs.append(temp_df)
+    # Convertimos cada cuadro a formato largo y agregamos la dirección del flujo.
+    for df, cuadro, id_flujo, flujo in [
+        (df1, "CE167", 1, "Ingresos"),
+        (df2, "CE169", 2, "Egresos"),
+    ]:
+        nombres = df.columns.str[3:].str.strip().map(lambda x: ALIAS_PAISES.get(x, x))
+
+        dfs.append(
+            convertir_a_largo(
+                df,
+                {
+                    "ID_PAIS": mapear(nombres, PAISES),
+                    "PAIS": nombres,
+                    "ID_FLUJO": id_flujo,
+                    "FLUJO": flujo,
+                },
+                cuadro,
+            )
+        )
 
-    # Iteramos sobre cada país.
-    for pais in df2.columns:
-        nombre_pais = pais[3:].strip()
+    # Unimos los DataFrames de cada flujo en uno solo.
+    final = pd.concat(dfs, ignore_index=True)
 
-        # Creamos un DataFrame temporal y llenamos los valores necesarios.
-        temp_df = df2[pais].to_frame("VALOR_USD")
-        temp_df["ID_PAIS"] = PAISES[nombre_pais]
-        temp_df["PAIS"] = nombre_pais
-        temp_df["ID_FLUJO"] = 2
-        temp_df["FLUJO"] = "Egresos"
+    # Sumamos los países que comparten nombre después de aplicar los alias.
+    final = final.groupby(
+        ["PERIODO", "ID_PAIS", "PAIS", "ID_FLUJO", "FLUJO"], as_index=False, sort=False
+    )["VALOR_USD"].sum()
 
-        dfs.append(temp_df)
+    # Guardamos el archivo en la carpeta data.
+    guardar(final, "remesas_pais", incremental)
 
-    # Unimos los DataFrames de cada país en uno solo.
-    final = pd.concat(dfs)
 
-    # Reseteamos el índice.
-    final.reset_index(names=["PERIODO"], inplace=True)
+def descargar_remesas_municipio(archivos, incremental=False):
+    """
+    Descarga los ingresos trimestrales por remesas
+    según municipio de destino.
+    """
 
-    # Arregalmos algunas columnas.
-    final["PERIODO"] = final["PERIODO"].apply(arreglar_fecha_trimestre)
-    final["VALOR_USD"] = final["VALOR_USD"].astype(float) * 1000000
-    final["VALOR_USD"] = final["VALOR_USD"].astype(int)
+    periodos, municipios, entidades, valores = leer_cuadro(
+        archivos, "CE166", interpretar_cuadro_municipios
+    )
 
-    # Ordenamos las columnas.
-    final = final[["PERIODO", "ID_PAIS", "PAIS", "ID_FLUJO", "FLUJO", "VALOR_USD"]]
+    # Resolvemos la clave de todos los municipios a la vez.
+    claves = resolver_municipios(pd.Series(municipios), pd.Series(entidades))
+
+    # Volteamos las cifras para que los municipios sean las columnas
+    # y convertimos los periodos a fechas antes de cambiar el formato.
+    df = pd.DataFrame(
+        valores.T, index=convertir_periodos(periodos), columns=claves["CVE"]
+    )
 
-    # Ordenamos todo el DataFrame.
-    final.sort_values(list(final.columns), inplace=True)
+    # Convertimos el cuadro a formato largo.
+    final = convertir_a_largo(
+        df,
+        {
+            "CVE_GEO": claves["CVE"],
+            "ENTIDAD": claves["Entidad"],
+            "MUNICIPIO": claves["Municipio"],
+        },
+        "CE166",
+    )
 
     # Guardamos el archivo en la carpeta data.
-    final.to_csv("./data/remesas_pais.csv", index=False, encoding="utf-8")
+    guardar(final, "remesas_municipio", incremental)
 
 
-def descargar_remesas_municipio():
+def descargar_remesas_usa(archivos, incremental=False):
     """
     Descarga los ingresos trimestrales por remesas
-    según municipio de destino.
+    provenientes de Estados Unidos según estado de origen.
     """
 
-    # Vamos a crear un DataFrame con los municipios no identificados.
-    data = list()
+    df = leer_cuadro(archivos, "CE168")
 
-    for k, v in ENTIDADES.items():
-        data.append({"CVE": f"{k:02}999", "Entidad": v, "Municipio": "No identificado"})
+    # Seleccionamos las filas y columnas necesarias.
+    df = df.iloc[2:55, 1:].transpose()
 
-    no_identificados = pd.DataFrame.from_records(data)
+    # Convertimos los periodos a fechas antes de cambiar el formato.
+    df.index = convertir_periodos(df.index)
 
-    # Cargamos el diccionario de municipios.
-    municipios = pd.read_csv("./assets/poblacion.csv", dtype={"CVE": str})
+    # Quitamos la sangría que antecede al nombre de cada estado.
+    nombres = df.columns.str[3:].str.strip()
 
-    # Solo necesitaremos las primeras 3 columnas.
-    municipios = municipios.iloc[:, :3]
+    # Convertimos el cuadro a formato largo.
+    final = convertir_a_largo(
+        df,
+        {"ID_ESTADO": mapear(nombres, ABREVIACIONES_USA), "ESTADO": nombres},
+        "CE168",
+    )
 
-    # Agregamos los municipios no identificados.
-    municipios = pd.concat([municipios, no_identificados])
+    # Guardamos el archivo en la carpeta data.
+    guardar(final, "remesas_usa", incremental)
 
-    # Peparamos el diccionario.
-    municipios.index = municipios["Municipio"] + "@" + municipios["Entidad"]
 
-    # Para este diccionario nuestros valores serán el código del municipio.
-    municipios = municipios["CVE"]
+def generar_agregado(nombre, archivos, incremental=False):
+    """
+    Genera un agregado anual o trimestral a partir de su conjunto de datos de origen.
 
-    df = pd.read_excel(
-        REMESAS_MUNICIPIO_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
+    El agregado siempre se calcula completo, ya que sus periodos
+    más recientes cambian con cada actualización del origen.
 
-    dfs = list()
+    Parameters
+    ----------
+    nombre : str
+        El nombre del agregado en esquemas.AGREGADOS.
 
-    # La primera columna no tiene nombre fijo.
-    # Nos vamos a referir a esta de forma dinámica.
-    primera_columna = df.columns[0]
+    archivos : dict
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    # Vamos a extraer el nombre del estado.
-    # Las filas con ● son estados.
-    df[primera_columna] = df.index.map(lambda x: x if "●" in x else None)
-    df[primera_columna] = df[primera_columna].ffill()
+    incremental : bool
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    # Ya que hemos asignado la entidad para cada municipio
-    # solo seleccionaremos filas de municpiios.
-    df = df[df.index.str.contains("⚬")]
+    """
 
-    # Ahora arreglamos el nombre del municipio.
-    df.index = df.apply(
-        lambda x: f"{x.name[3:].strip()}@{x[primera_columna][2:].strip()}", axis=1
-    )
+    guardar(calcular_agregado(nombre), nombre)
 
-    # Vamos a corregir los registros del Estado de México.
-    df.index = df.index.str.replace("@México", "@Estado de México")
 
-    # Omitimos la primera columna yvolteamos el
-    # DataFrame para que los municipios sean las columnas.
-    df = df.iloc[:, 1:].transpose()
+def generar_deflactores(archivos, incremental=False):
+    """
+    Genera los deflactores mensuales y trimestrales a partir
+    del INPC y del tipo de cambio.
 
-    # Iteramos sobre cada municipio.
-    for municipio in df.columns:
-        nombre_municipio, nombre_entidad = municipio.split("@")
-        cve_geo = municipios.loc[municipio]
+    Parameters
+    ----------
+    archivos : dict
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-        # Creamos un DataFrame temporal y llenamos los valores necesarios.
-        temp_df = df[municipio].to_frame("VALOR_USD")
+    incremental : bool
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-        temp_df["CVE_GEO"] = cve_geo
-        temp_df["ENTIDAD"] = nombre_entidad
-        temp_df["MUNICIPIO"] = nombre_municipio
+    """
 
-        dfs.append(temp_df)
+    for nombre in DEFLACTORES.values():
+        guardar(calcular_deflactores(nombre), nombre)
 
-    # Unimos los DataFrames de cada entidad en uno solo.
-    final = pd.concat(dfs)
 
-    # Reseteamos el índice.
-    final.reset_index(names=["PERIODO"], inplace=True)
+def generar_pib(archivos, incremental=False):
+    """
+    Convierte el PIB estatal en matrices y cubos de NumPy.
 
-    # Arregalmos algunas columnas.
-    final["PERIODO"] = final["PERIODO"].apply(arreglar_fecha_trimestre)
-    final["VALOR_USD"] = final["VALOR_USD"].astype(float) * 1000000
-    final["VALOR_USD"] = final["VALOR_USD"].astype(int)
+    Parameters
+    ----------
+    archivos : dict
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    # Ordenamos las columnas.
-    final = final[["PERIODO", "CVE_GEO", "ENTIDAD", "MUNICIPIO", "VALOR_USD"]]
+    incremental : bool
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    # Ordenamos todo el DataFrame.
-    final.sort_values(list(final.columns), inplace=True)
+    """
 
-    # Guardamos el archivo en la carpeta data.
-    final.to_csv("./data/remesas_municipio.csv", index=False, encoding="utf-8")
+    with medir("escritura") as medicion:
+        medicion["filas"] = generar_matrices()
+        medicion["bytes_salida"] = sum(
+            entrada.stat().st_size for entrada in os.scandir(CARPETA_PIB)
+        )
 
 
-def descargar_remesas_usa():
-    """
-    Descarga los ingresos trimestrales por remesas
-    provenientes de Estados Unidos según estado de origen.
+def cargar_almacen(archivos, incremental=False):
     """
+    Carga todos los conjuntos de datos en la base de datos SQLite.
 
-    df = pd.read_excel(
-        REMESAS_USA_URL.format(ENERO_1991, FECHA_FIN), skiprows=9, index_col=1
-    )
+    Parameters
+    ----------
+    archivos : dict
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    dfs = list()
+    incremental : bool
+        No se usa, se recibe para tener la misma firma que las demás etapas.
 
-    # Seleccionamos las filas y columnas necesarias.
-    df = df.iloc[2:55, 1:].transpose()
+    """
 
-    # Iteramos sobre cada estado.
-    for estado in df.columns:
-        nombre_estado = estado[3:].strip()
+    with medir("escritura") as medicion:
+        medicion["filas"] = generar_almacen()
+        medicion["bytes_salida"] = os.path.getsize(RUTA_ALMACEN)
+
+
+# Cada etapa del ETL con los cuadros que necesita.
+# Cada etapa declara los cuadros que procesa, los archivos que lee y los
+# archivos que escribe. grafo.py usa estas declaraciones para ordenar las
+# etapas, ejecutarlas en paralelo y omitir las que no tienen cambios.
+ETAPAS = {
+    "descargar_ipc": {
+        "funcion": descargar_ipc,
+        "cuadros": ["CP154"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["IPC"]["ruta"]],
+    },
+    "descargar_tipo_cambio": {
+        "funcion": descargar_tipo_cambio,
+        "cuadros": ["CF86"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["USDMXN"]["ruta"]],
+    },
+    "descargar_remesas_mensuales": {
+        "funcion": descargar_remesas_mensuales,
+        "cuadros": ["CE81", "CE165"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["remesas_mensuales"]["ruta"]],
+    },
+    "descargar_remesas_entidad": {
+        "funcion": descargar_remesas_entidad,
+        "cuadros": ["CE100"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["remesas_entidad"]["ruta"]],
+    },
+    "descargar_remesas_pais": {
+        "funcion": descargar_remesas_pais,
+        "cuadros": ["CE167", "CE169"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["remesas_pais"]["ruta"]],
+    },
+    "descargar_remesas_municipio": {
+        "funcion": descargar_remesas_municipio,
+        "cuadros": ["CE166"],
+        "entradas": ["./assets/poblacion.csv"],
+        "salidas": [ESQUEMAS["remesas_municipio"]["ruta"]],
+    },
+    "descargar_remesas_usa": {
+        "funcion": descargar_remesas_usa,
+        "cuadros": ["CE168"],
+        "entradas": [],
+        "salidas": [ESQUEMAS["remesas_usa"]["ruta"]],
+    },
+    "generar_deflactores": {
+        "funcion": generar_deflactores,
+        "cuadros": [],
+        "entradas": [ESQUEMAS["IPC"]["ruta"], ESQUEMAS["USDMXN"]["ruta"]],
+        "salidas": [ESQUEMAS[nombre]["ruta"] for nombre in DEFLACTORES.values()],
+    },
+}
 
-        # Creamos un DataFrame temporal y llenamos los valores necesarios.
-        temp_df = df[estado].to_frame("VALOR_USD")
-        temp_df["ID_ESTADO"] = ABREVIACIONES_USA[nombre_estado]
-        temp_df["ESTADO"] = nombre_estado
+# Los agregados dependen de la etapa que escribe su conjunto de datos de origen.
+for nombre, (origen, _) in AGREGADOS.items():
+    ETAPAS[f"generar_{nombre}"] = {
+        "funcion": partial(generar_agregado, nombre),
+        "cuadros": [],
+        "entradas": [ESQUEMAS[origen]["ruta"]],
+        "salidas": [ESQUEMAS[nombre]["ruta"]],
+    }
+
+ETAPAS["generar_pib"] = {
+    "funcion": generar_pib,
+    "cuadros": [],
+    "entradas": [RUTA_PIB],
+    "salidas": [f"{CARPETA_PIB}/indice.json"],
+}
 
-        dfs.append(temp_df)
+# La base de datos se genera al final, con todos los archivos ya escritos.
+ETAPAS["cargar_almacen"] = {
+    "funcion": cargar_almacen,
+    "cuadros": [],
+    "entradas": list(TABLAS.values()),
+    "salidas": [RUTA_ALMACEN],
+}
 
-    # Unimos los DataFrames de cada entidad en uno solo.
-    final = pd.concat(dfs)
 
-    # Reseteamos el índice.
-    final.reset_index(names=["PERIODO"], inplace=True)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--hilos",
+        type=int,
+        default=MAX_HILOS,
+        help="Número máximo de descargas simultáneas.",
+    )
+    parser.add_argument(
+        "--por-servidor",
+        type=int,
+        default=MAX_POR_SERVIDOR,
+        help="Número máximo de descargas simultáneas a un mismo servidor.",
+    )
+    parser.add_argument(
+        "--etapas",
+        type=int,
+        default=MAX_ETAPAS,
+        help="Número máximo de etapas que se procesan al mismo tiempo.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Solo descarga los periodos recientes y actualiza los archivos existentes.",
+    )
+    parser.add_argument(
+        "--forzar",
+        action="store_true",
+        help="Ejecuta todas las etapas aunque sus entradas no hayan cambiado.",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=TTL_CACHE / 3600,
+        help="Horas durante las cuales los archivos en caché se consideran vigentes.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Solo usa los archivos en caché, sin descargar nada.",
+    )
+    parser.add_argument(
+        "--reporte",
+        metavar="RUTA",
+        help="Guarda las métricas de cada etapa en un archivo .json o .csv.",
+    )
+    parser.add_argument(
+        "--tabla",
+        action="store_true",
+        help="Muestra las métricas de cada etapa en la salida de errores.",
+    )
+    parser.add_argument(
+        "--memoria",
+        action="store_true",
+        help="Mide el pico de memoria de cada etapa. Las etapas se ejecutan una por una.",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="ORIGEN",
+        help="Carpeta con archivos grabados o URL de un servidor local que reemplaza a Banxico.",
+    )
+    args = parser.parse_args()
 
-    # Arregalmos algunas columnas.
-    final["PERIODO"] = final["PERIODO"].apply(arreglar_fecha_trimestre)
-    final["VALOR_USD"] = final["VALOR_USD"].astype(float) * 1000000
-    final["VALOR_USD"] = final["VALOR_USD"].astype(int)
+    # tracemalloc mide todo el proceso, por eso las etapas no pueden ser simultáneas.
+    if args.memoria:
+        tracemalloc.start()
+        args.etapas = 1
 
-    # Ordenamos las columnas.
-    final = final[["PERIODO", "ID_ESTADO", "ESTADO", "VALOR_USD"]]
+    urls = construir_urls(args.incremental)
 
-    # Ordenamos todo el DataFrame.
-    final.sort_values(list(final.columns), inplace=True)
+    if args.replay:
+        urls = redirigir_urls(urls, args.replay)
 
-    # Guardamos el archivo en la carpeta data.
-    final.to_csv("./data/remesas_usa.csv", index=False, encoding="utf-8")
+    # Descargamos todos los cuadros en paralelo antes de procesarlos.
+    archivos = descargar_cuadros(
+        urls,
+        max_hilos=args.hilos,
+        ttl=args.ttl * 3600,
+        offline=args.offline,
+        max_por_servidor=args.por_servidor,
+    )
 
+    resultados = ejecutar_grafo(
+        ETAPAS, archivos, args.incremental, max_etapas=args.etapas, forzar=args.forzar
+    )
 
-if __name__ == "__main__":
-    descargar_ipc()
-    descargar_tipo_cambio()
-
-    descargar_remesas_mensuales()
-    descargar_remesas_entidad()
-    descargar_remesas_pais()
-    descargar_remesas_municipio()
-    descargar_remesas_usa()
+    for nombre in ETAPAS:
+        if resultados[nombre] == "omitida":
+            print(f"Sin cambios: {nombre}")
+
+    if args.reporte or args.tabla:
+        # Las descargas se registran por cuadro, las asignamos a su etapa.
+        metricas = resumen(
+            cuadros={
+                cuadro: nombre
+                for nombre, definicion in ETAPAS.items()
+                for cuadro in definicion["cuadros"]
+            }
+        )
+
+        if args.reporte:
+            guardar_reporte(metricas, args.reporte)
+
+        if args.tabla:
+            imprimir_tabla(metricas)
@@ -0,0 +1,380 @@
+"""
+Este módulo centraliza los archivos GeoJSON usados en los mapas.
+
+Cada archivo se interpreta una sola vez por proceso. La primera vez que
+se lee, el GeoJSON ya interpretado se guarda en formato pickle en la
+carpeta cache/geometrias con el hash del archivo original como parte
+del nombre, así los siguientes procesos lo cargan sin interpretar el
+JSON. Si el archivo original cambia, su hash también y el pickle se
+vuelve a generar.
+
+El pickle se conserva en memoria y cada llamada a cargar_geojson()
+regresa una copia nueva, mucho más rápida de obtener que interpretar el
+JSON, por lo que se puede modificar sin alterar las de otras llamadas.
+Las búsquedas también regresan copias de las geometrías.
+
+Los niveles disponibles son:
+
+    - estatal: assets/mexico.json, con CVEGEO, CVE_ENT y NOM_ENT.
+    - municipal: assets/municipios.json, con CVEGEO de 5 dígitos.
+
+Las geometrías también se pueden buscar por el valor de cualquiera de
+sus propiedades, por ejemplo CVEGEO='14' o NOM_ENT='Jalisco'.
+
+Además de la resolución completa, cada nivel tiene tres resoluciones
+simplificadas con simplificacion.py (alta, media y baja), guardadas en
+la carpeta assets/geometrias. Los mapas escogen la resolución con
+obtener_geojson() según el ancho de la imagen: la más simplificada cuya
+tolerancia no supere medio pixel. Las resoluciones se pueden generar de
+antemano con:
+
+    python geometrias.py estatal municipal
+
+Si no existen o son más antiguas que el GeoJSON original, se generan
+al momento de cargarlas.
+"""
+
+import argparse
+import copy
+import glob
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+
+from puntos_control import archivo_temporal
+from simplificacion import simplificar_geojson
+
+
+# Archivo GeoJSON de cada nivel geográfico.
+GEOMETRIAS = {
+    "estatal": "./assets/mexico.json",
+    "municipal": "./assets/municipios.json",
+}
+
+# Carpeta donde se guardan los GeoJSON ya interpretados.
+CARPETA_GEOMETRIAS = "./cache/geometrias"
+
+# Tolerancia, en grados, de cada resolución simplificada.
+RESOLUCIONES = {"alta": 0.002, "media": 0.008, "baja": 0.02}
+
+# Carpeta donde se guardan las resoluciones simplificadas.
+CARPETA_RESOLUCIONES = "./assets/geometrias"
+
+# Extensión aproximada de México de oeste a este, en grados.
+EXTENSION_MEXICO = 32
+
+
+def ruta_geojson(nivel, resolucion="completa"):
+    """
+    Regresa la ruta del GeoJSON de un nivel y una resolución.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    resolucion : str
+        Puede ser 'completa', 'alta', 'media' o 'baja'.
+
+    Returns
+    -------
+    str
+        La ruta del archivo GeoJSON.
+
+    """
+
+    if nivel not in GEOMETRIAS:
+        raise ValueError(f"Nivel desconocido: {nivel}. Puede ser {list(GEOMETRIAS)}.")
+
+    if resolucion == "completa":
+        return GEOMETRIAS[nivel]
+
+    if resolucion not in RESOLUCIONES:
+        raise ValueError(
+            f"Resolución desconocida: {resolucion}. "
+            f"Puede ser {['completa'] + list(RESOLUCIONES)}."
+        )
+
+    return os.path.join(CARPETA_RESOLUCIONES, f"{nivel}_{resolucion}.json")
+
+
+def generar_resoluciones(nivel):
+    """
+    Genera las resoluciones simplificadas del GeoJSON de un nivel.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    Returns
+    -------
+    dict
+        El tamaño en bytes de cada resolución, incluyendo la completa.
+
+    """
+
+    geojson = cargar_geojson(nivel)
+    tamaños = {"completa": os.path.getsize(ruta_geojson(nivel))}
+
+    os.makedirs(CARPETA_RESOLUCIONES, exist_ok=True)
+
+    for resolucion, tolerancia in RESOLUCIONES.items():
+        ruta = ruta_geojson(nivel, resolucion)
+
+        with archivo_temporal(ruta) as temporal:
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(
+                    simplificar_geojson(geojson, tolerancia),
+                    archivo,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+
+        tamaños[resolucion] = os.path.getsize(ruta)
+
+    return tamaños
+
+
+@lru_cache(maxsize=None)
+def leer_geojson(nivel="estatal", resolucion="completa"):
+    """
+    Lee el GeoJSON de un nivel geográfico ya interpretado en formato pickle.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    resolucion : str
+        Puede ser 'completa', 'alta', 'media' o 'baja'.
+
+    Returns
+    -------
+    bytes
+        El GeoJSON (FeatureCollection) en formato pickle.
+
+    """
+
+    ruta = ruta_geojson(nivel, resolucion)
+
+    if resolucion != "completa" and (
+        not os.path.exists(ruta)
+        or os.path.getmtime(ruta) < os.path.getmtime(ruta_geojson(nivel))
+    ):
+        generar_resoluciones(nivel)
+
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+
+    huella = hashlib.sha256(contenido).hexdigest()[:16]
+    ruta = os.path.join(CARPETA_GEOMETRIAS, f"{nivel}_{resolucion}_{huella}.pkl")
+
+    if os.path.exists(ruta):
+        with open(ruta, "rb") as archivo:
+            return archivo.read()
+
+    geojson = json.loads(contenido)
+    serializado = pickle.dumps(geojson, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Eliminamos los GeoJSON de versiones anteriores del archivo.
+    patron = os.path.join(CARPETA_GEOMETRIAS, f"{nivel}_{resolucion}_*.pkl")
+
+    for anterior in glob.glob(patron):
+        os.remove(anterior)
+
+    os.makedirs(CARPETA_GEOMETRIAS, exist_ok=True)
+
+    with archivo_temporal(ruta) as temporal:
+        with open(temporal, "wb") as archivo:
+            archivo.write(serializado)
+
+    return serializado
+
+
+def cargar_geojson(nivel="estatal", resolucion="completa"):
+    """
+    Carga el GeoJSON de un nivel geográfico.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    resolucion : str
+        Puede ser 'completa', 'alta', 'media' o 'baja'.
+
+    Returns
+    -------
+    dict
+        El GeoJSON (FeatureCollection). Cada llamada regresa una copia nueva.
+
+    """
+
+    return pickle.loads(leer_geojson(nivel, resolucion))
+
+
+def escoger_resolucion(ancho):
+    """
+    Escoge la resolución más simplificada que no se nota en una imagen.
+
+    Parameters
+    ----------
+    ancho : int
+        El ancho de la imagen en pixeles.
+
+    Returns
+    -------
+    str
+        La resolución cuya tolerancia no supera medio pixel,
+        o 'completa' si ninguna cumple.
+
+    """
+
+    medio_pixel = EXTENSION_MEXICO / ancho / 2
+
+    for resolucion, tolerancia in sorted(
+        RESOLUCIONES.items(), key=lambda item: item[1], reverse=True
+    ):
+        if tolerancia <= medio_pixel:
+            return resolucion
+
+    return "completa"
+
+
+def obtener_geojson(nivel, ancho):
+    """
+    Carga el GeoJSON de un nivel con la resolución adecuada para una imagen.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    ancho : int
+        El ancho de la imagen en pixeles.
+
+    Returns
+    -------
+    dict
+        El GeoJSON (FeatureCollection). Cada llamada regresa una copia nueva.
+
+    """
+
+    return cargar_geojson(nivel, escoger_resolucion(ancho))
+
+
+@lru_cache(maxsize=None)
+def indexar_geometrias(nivel, propiedad):
+    """
+    Agrupa las geometrías de un nivel por el valor de una propiedad.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    propiedad : str
+        El nombre de la propiedad, por ejemplo 'CVEGEO' o 'NOM_ENT'.
+
+    Returns
+    -------
+    dict
+        Diccionario con el valor de la propiedad como llave y la lista
+        de geometrías (Feature) con ese valor como valor, compartido
+        por todas las llamadas.
+
+    """
+
+    indice = dict()
+
+    for geometria in cargar_geojson(nivel)["features"]:
+        valor = geometria["properties"].get(propiedad)
+        indice.setdefault(valor, list()).append(geometria)
+
+    return indice
+
+
+def buscar_geometria(valor, nivel="estatal", propiedad="CVEGEO"):
+    """
+    Busca la geometría de una entidad o municipio.
+
+    Parameters
+    ----------
+    valor : str
+        El valor de la propiedad, por ejemplo '14' o 'Jalisco'.
+
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    propiedad : str
+        El nombre de la propiedad, por ejemplo 'CVEGEO' o 'NOM_ENT'.
+
+    Returns
+    -------
+    dict
+        Una copia de la geometría (Feature). Si varias tienen el mismo
+        valor, se regresa la primera.
+
+    Raises
+    ------
+    KeyError
+        Si ninguna geometría tiene ese valor.
+
+    """
+
+    indice = indexar_geometrias(nivel, propiedad)
+
+    if valor not in indice:
+        raise KeyError(f"No se encontró la geometría con {propiedad}={valor}")
+
+    return copy.deepcopy(indice[valor][0])
+
+
+def filtrar_geojson(valores, nivel="estatal", propiedad="CVEGEO"):
+    """
+    Crea un GeoJSON solo con las geometrías que tienen los valores indicados.
+
+    Por ejemplo, filtrar_geojson(['Jalisco'], 'municipal', 'NOM_ENT')
+    regresa los municipios de Jalisco, si el archivo tiene esa propiedad.
+
+    Parameters
+    ----------
+    valores : list
+        Los valores permitidos de la propiedad.
+
+    nivel : str
+        Puede ser 'estatal' o 'municipal'.
+
+    propiedad : str
+        El nombre de la propiedad, por ejemplo 'CVEGEO' o 'NOM_ENT'.
+
+    Returns
+    -------
+    dict
+        Un GeoJSON (FeatureCollection) con copias de las geometrías encontradas.
+
+    """
+
+    indice = indexar_geometrias(nivel, propiedad)
+
+    return {
+        "type": "FeatureCollection",
+        "features": copy.deepcopy(
+            [geometria for valor in valores for geometria in indice.get(valor, list())]
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("niveles", nargs="+", choices=list(GEOMETRIAS))
+    args = parser.parse_args()
+
+    for nivel in args.niveles:
+        for resolucion, tamaño in generar_resoluciones(nivel).items():
+            print(f"{nivel} {resolucion}: {tamaño / 1000000:,.2f} MB")
@@ -0,0 +1,228 @@
+"""
+Este módulo ejecuta las etapas del ETL como un grafo de dependencias.
+
+Cada etapa declara los cuadros del SIE que procesa, los archivos que lee
+y los archivos que escribe. Una etapa depende de otra cuando lee alguno
+de sus archivos de salida. Las etapas independientes se ejecutan de forma
+concurrente y cada una inicia en cuanto terminan sus dependencias.
+
+Antes de ejecutar una etapa se calcula una huella con el contenido de
+todas sus entradas. Si la huella es igual a la de la última ejecución
+exitosa y sus archivos de salida existen, la etapa se omite.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from instrumentacion import etapa
+from puntos_control import archivo_temporal
+
+
+# Archivo donde se guarda la huella de la última ejecución de cada etapa.
+ARCHIVO_HUELLAS = "./cache/etapas.json"
+
+# Número máximo de etapas que se ejecutan al mismo tiempo.
+MAX_ETAPAS = 4
+
+
+def calcular_dependencias(etapas):
+    """
+    Obtiene las etapas de las que depende cada etapa.
+
+    Parameters
+    ----------
+    etapas : dict
+        Diccionario con el nombre de cada etapa como llave y su definición
+        (funcion, cuadros, entradas y salidas) como valor.
+
+    Returns
+    -------
+    dict
+        Diccionario con el nombre de cada etapa como llave y el conjunto
+        de etapas que escriben alguno de sus archivos de entrada como valor.
+
+    """
+
+    productores = {
+        salida: nombre
+        for nombre, definicion in etapas.items()
+        for salida in definicion["salidas"]
+    }
+
+    return {
+        nombre: {
+            productores[entrada]
+            for entrada in definicion["entradas"]
+            if entrada in productores and productores[entrada] != nombre
+        }
+        for nombre, definicion in etapas.items()
+    }
+
+
+def calcular_huella(nombre, definicion, archivos):
+    """
+    Calcula la huella SHA-256 de las entradas de una etapa.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de la etapa.
+
+    definicion : dict
+        La definición de la etapa.
+
+    archivos : dict
+        Diccionario con el contenido crudo de cada cuadro.
+
+    Returns
+    -------
+    str
+        La huella en formato hexadecimal.
+
+    """
+
+    huella = hashlib.sha256(nombre.encode("utf-8"))
+
+    for cuadro in definicion["cuadros"]:
+        huella.update(cuadro.encode("utf-8"))
+        huella.update(hashlib.sha256(archivos[cuadro]).digest())
+
+    for entrada in definicion["entradas"]:
+        huella.update(entrada.encode("utf-8"))
+
+        with open(entrada, "rb") as archivo:
+            huella.update(hashlib.sha256(archivo.read()).digest())
+
+    return huella.hexdigest()
+
+
+def leer_huellas():
+    """
+    Lee las huellas de la última ejecución de cada etapa.
+
+    Returns
+    -------
+    dict
+        Diccionario con el nombre de cada etapa como llave y su huella como valor.
+
+    """
+
+    if not os.path.exists(ARCHIVO_HUELLAS):
+        return dict()
+
+    with open(ARCHIVO_HUELLAS, "r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def escribir_huellas(huellas):
+    """
+    Escribe las huellas de la última ejecución de cada etapa.
+
+    Parameters
+    ----------
+    huellas : dict
+        Diccionario con el nombre de cada etapa como llave y su huella como valor.
+
+    """
+
+    os.makedirs(os.path.dirname(ARCHIVO_HUELLAS), exist_ok=True)
+
+    with archivo_temporal(ARCHIVO_HUELLAS) as temporal:
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(huellas, archivo, indent=4, sort_keys=True)
+
+
+def ejecutar_grafo(
+    etapas, archivos, incremental=False, max_etapas=MAX_ETAPAS, forzar=False
+):
+    """
+    Ejecuta las etapas respetando sus dependencias.
+
+    Parameters
+    ----------
+    etapas : dict
+        Diccionario con el nombre de cada etapa como llave y su definición
+        como valor. La función de cada etapa recibe el diccionario de
+        archivos y el parámetro incremental.
+
+    archivos : dict
+        Diccionario con el contenido crudo de cada cuadro.
+
+    incremental : bool
+        Se pasa a la función de cada etapa.
+
+    max_etapas : int
+        El número máximo de etapas que se ejecutan al mismo tiempo.
+
+    forzar : bool
+        Si es True, todas las etapas se ejecutan aunque sus entradas no hayan cambiado.
+
+    Returns
+    -------
+    dict
+        Diccionario con el nombre de cada etapa como llave y
+        'ejecutada' u 'omitida' como valor.
+
+    Raises
+    ------
+    ValueError
+        Si las dependencias forman un ciclo.
+
+    """
+
+    dependencias = calcular_dependencias(etapas)
+    huellas = leer_huellas()
+    candado = threading.Lock()
+
+    def ejecutar_etapa(nombre):
+        definicion = etapas[nombre]
+        huella = calcular_huella(nombre, definicion, archivos)
+
+        existen = all(os.path.exists(salida) for salida in definicion["salidas"])
+
+        if not forzar and existen and huellas.get(nombre) == huella:
+            return "omitida"
+
+        with etapa(nombre):
+            definicion["funcion"](archivos, incremental)
+
+        # Solo registramos la huella después de escribir las salidas.
+        with candado:
+            huellas[nombre] = huella
+            escribir_huellas(huellas)
+
+        return "ejecutada"
+
+    pendientes = dict(dependencias)
+    resultados = dict()
+
+    with ThreadPoolExecutor(max_workers=max_etapas) as executor:
+        en_curso = dict()
+
+        while pendientes or en_curso:
+            # Una etapa está lista cuando todas sus dependencias terminaron.
+            listas = [
+                nombre
+                for nombre, requeridas in pendientes.items()
+                if requeridas <= resultados.keys()
+            ]
+
+            for nombre in listas:
+                en_curso[executor.submit(ejecutar_etapa, nombre)] = nombre
+                del pendientes[nombre]
+
+            if not en_curso:
+                raise ValueError(
+                    f"Las etapas tienen dependencias circulares: {list(pendientes)}"
+                )
+
+            terminadas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+
+            for futuro in terminadas:
+                # Si alguna etapa falla, la excepción se propaga aquí.
+                resultados[en_curso.pop(futuro)] = futuro.result()
+
+    return resultados
@@ -0,0 +1,189 @@
+"""
+Este módulo convierte cifras en dólares corrientes a pesos constantes.
+
+La conversión usa los deflactores generados por el ETL (ver datos.py):
+el multiplicador de cada periodo es el tipo de cambio por el factor
+que lleva los precios de ese periodo a los del INPC de referencia. Por
+defecto la referencia es el último mes con INPC y tipo de cambio, pero
+se puede escoger cualquier otro mes. En ese caso los multiplicadores
+se reescalan con el factor guardado del mes escogido, sin volver a
+calcularlos, por lo que la fecha reportada siempre corresponde a los
+factores aplicados.
+
+deflactar() acepta paneles mensuales o trimestrales en dos formatos:
+
+    - ancho: el periodo es el índice y cada columna es una serie,
+      por ejemplo una entidad. Se deflactan todas las columnas.
+    - largo: el periodo es una columna (PERIODO) y se deflactan solo
+      las columnas indicadas, por defecto VALOR_USD.
+
+En ambos casos también regresa la fecha de referencia utilizada, que
+sirve para los títulos y notas de las gráficas ('junio de 2026').
+"""
+
+import pandas as pd
+
+from datos import cargar_deflactores
+from esquemas import INDICES_INPC
+
+
+# Nombre de cada mes para describir la fecha de referencia.
+MESES = [
+    "enero",
+    "febrero",
+    "marzo",
+    "abril",
+    "mayo",
+    "junio",
+    "julio",
+    "agosto",
+    "septiembre",
+    "octubre",
+    "noviembre",
+    "diciembre",
+]
+
+
+def fecha_base(base=None):
+    """
+    Obtiene el mes de referencia de los precios constantes.
+
+    Parameters
+    ----------
+    base : str, datetime o None
+        Cualquier fecha dentro del mes de referencia, por ejemplo
+        '2024-12'. Por defecto se usa el último mes de los deflactores,
+        que es la referencia de sus factores.
+
+    Returns
+    -------
+    pandas.Timestamp
+        El inicio del mes de referencia.
+
+    Raises
+    ------
+    ValueError
+        Si no hay INPC para el mes indicado.
+
+    """
+
+    meses = cargar_deflactores("MS").index
+
+    if base is None:
+        return meses[-1]
+
+    fecha = pd.Timestamp(base).to_period("M").start_time
+
+    if fecha not in meses:
+        raise ValueError(
+            f"No hay INPC para {fecha:%Y-%m}. "
+            f"El INPC va de {meses[0]:%Y-%m} a {meses[-1]:%Y-%m}."
+        )
+
+    return fecha
+
+
+def describir_fecha(fecha):
+    """
+    Describe un mes en texto, por ejemplo 'junio de 2026'.
+
+    Parameters
+    ----------
+    fecha : datetime
+        Cualquier fecha dentro del mes.
+
+    Returns
+    -------
+    str
+        El nombre del mes y el año.
+
+    """
+
+    return f"{MESES[fecha.month - 1]} de {fecha.year}"
+
+
+def obtener_multiplicadores(frecuencia="MS", base=None, indice="GENERAL"):
+    """
+    Obtiene el multiplicador de cada periodo para convertir dólares
+    corrientes a pesos constantes.
+
+    Parameters
+    ----------
+    frecuencia : str
+        Puede ser 'MS' (mensual) o 'QS' (trimestral).
+
+    base : str, datetime o None
+        El mes de referencia. Por defecto el último mes de los deflactores.
+
+    indice : str
+        Puede ser 'GENERAL', 'SUBYACENTE' o 'NO_SUBYACENTE'.
+
+    Returns
+    -------
+    tuple
+        Una pandas.Series con el periodo como índice y el inicio del
+        mes de referencia (pandas.Timestamp).
+
+    """
+
+    if indice not in INDICES_INPC:
+        raise ValueError(f"Índice desconocido: {indice}. Puede ser {INDICES_INPC}.")
+
+    fecha = fecha_base(base)
+    multiplicadores = cargar_deflactores(frecuencia)[f"MULTIPLICADOR_{indice}"]
+
+    # El factor guardado de cada mes es el cociente entre el INPC de la
+    # referencia y el de ese mes, por lo que dividir entre el factor del
+    # mes base cambia la referencia a ese mes usando la misma serie.
+    factor = cargar_deflactores("MS").at[fecha, f"FACTOR_{indice}"]
+
+    if factor != 1:
+        multiplicadores = multiplicadores / factor
+
+    return multiplicadores, fecha
+
+
+def deflactar(panel, frecuencia="MS", base=None, indice="GENERAL", columnas=None):
+    """
+    Convierte un panel en dólares corrientes a pesos constantes.
+
+    Parameters
+    ----------
+    panel : pandas.DataFrame o pandas.Series
+        Las cifras en dólares. En formato ancho el periodo es el índice;
+        en formato largo el periodo es la columna PERIODO.
+
+    frecuencia : str
+        La frecuencia del panel. Puede ser 'MS' (mensual) o 'QS' (trimestral).
+
+    base : str, datetime o None
+        El mes de referencia. Por defecto el último mes de los deflactores.
+
+    indice : str
+        Puede ser 'GENERAL', 'SUBYACENTE' o 'NO_SUBYACENTE'.
+
+    columnas : list
+        Solo para el formato largo. Las columnas que se deflactan,
+        por defecto VALOR_USD.
+
+    Returns
+    -------
+    tuple
+        El panel en pesos constantes, con la misma forma que el original
+        (los periodos sin deflactor quedan como nulos), y el inicio del
+        mes de referencia (pandas.Timestamp).
+
+    """
+
+    multiplicadores, fecha = obtener_multiplicadores(frecuencia, base, indice)
+
+    if isinstance(panel, pd.DataFrame) and "PERIODO" in panel.columns:
+        columnas = columnas or ["VALOR_USD"]
+        panel = panel.copy()
+        panel[columnas] = panel[columnas].mul(
+            panel["PERIODO"].map(multiplicadores), axis=0
+        )
+        return panel, fecha
+
+    # Usamos un arreglo para conservar el nombre de la serie.
+    return panel.mul(multiplicadores.reindex(panel.index).to_numpy(), axis=0), fecha
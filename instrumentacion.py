@@ -0,0 +1,194 @@
+"""
+Este módulo registra el tiempo, los datos y la memoria de cada fase del ETL.
+
+Las fases (descarga, lectura, escritura) se asocian a la etapa que
+se está ejecutando, lo cual permite saber cuánto tiempo se pasa
+esperando a la red y cuánto procesando cada tabla. Cada fase puede
+agregar métricas a su medición, por ejemplo los bytes descargados
+o el número de filas escritas.
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+
+
+# Lista con las mediciones de la ejecución actual.
+REGISTRO = list()
+
+# Nombre de la etapa que se está ejecutando en el hilo actual.
+ETAPA_ACTUAL = ContextVar("etapa_actual", default=None)
+
+# Métricas adicionales de las mediciones y cómo se agregan por etapa.
+METRICAS = {
+    "bytes_descarga": "sum",
+    "filas": "sum",
+    "bytes_salida": "sum",
+    "memoria_pico": "max",
+}
+
+
+@contextmanager
+def medir(fase, etapa=None):
+    """
+    Mide el tiempo de una fase y lo agrega al registro.
+
+    La medición se regresa como un diccionario al que se
+    pueden agregar métricas dentro del bloque.
+
+    Parameters
+    ----------
+    fase : str
+        El nombre de la fase, por ejemplo 'lectura' o 'escritura'.
+
+    etapa : str
+        El nombre de la etapa. Por defecto se usa la etapa actual.
+
+    """
+
+    medicion = {"etapa": etapa or ETAPA_ACTUAL.get(), "fase": fase}
+    inicio = time.perf_counter()
+
+    try:
+        yield medicion
+    finally:
+        medicion["segundos"] = time.perf_counter() - inicio
+        REGISTRO.append(medicion)
+
+
+@contextmanager
+def etapa(nombre):
+    """
+    Marca el inicio y fin de una etapa del ETL.
+
+    Todas las fases medidas dentro de este bloque se asocian a la etapa.
+    Si tracemalloc está activo, también se registra el pico de memoria
+    de la etapa. El pico solo es exacto si las etapas se ejecutan una
+    por una, ya que tracemalloc mide todo el proceso.
+
+    Parameters
+    ----------
+    nombre : str
+        El nombre de la etapa.
+
+    """
+
+    token = ETAPA_ACTUAL.set(nombre)
+
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    try:
+        with medir("total", nombre) as medicion:
+            yield
+
+            if tracemalloc.is_tracing():
+                medicion["memoria_pico"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        ETAPA_ACTUAL.reset(token)
+
+
+def resumen(registro=None, cuadros=None):
+    """
+    Resume las mediciones en una tabla con una fila por etapa.
+
+    La fase de transformación es el tiempo total de la etapa
+    menos el tiempo de lectura y escritura.
+
+    Parameters
+    ----------
+    registro : list
+        Las mediciones. Por defecto se usa el registro global.
+
+    cuadros : dict
+        Diccionario con el ID de cada cuadro como llave y el nombre de su
+        etapa como valor. Las descargas se registran por cuadro y con este
+        diccionario se asignan a su etapa.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El tiempo en segundos de cada fase, los megabytes descargados,
+        las filas escritas, los megabytes del archivo de salida y el pico
+        de memoria en megabytes de cada etapa.
+
+    """
+
+    df = pd.DataFrame(registro if registro is not None else REGISTRO)
+
+    if cuadros:
+        df["etapa"] = df["etapa"].replace(cuadros)
+
+    for metrica in METRICAS:
+        if metrica not in df.columns:
+            df[metrica] = float("nan")
+
+    tiempos = df.pivot_table(
+        index="etapa", columns="fase", values="segundos", aggfunc="sum", fill_value=0
+    )
+
+    for fase in ["descarga", "lectura", "escritura", "total"]:
+        if fase not in tiempos.columns:
+            tiempos[fase] = 0.0
+
+    tiempos["transformacion"] = (
+        tiempos["total"] - tiempos["lectura"] - tiempos["escritura"]
+    )
+
+    metricas = df.groupby("etapa").agg(METRICAS)
+
+    final = tiempos[["descarga", "lectura", "transformacion", "escritura", "total"]]
+    final = final.copy()
+    final["descarga_mb"] = metricas["bytes_descarga"] / 1e6
+    final["filas"] = metricas["filas"].astype(int)
+    final["salida_mb"] = metricas["bytes_salida"] / 1e6
+    final["memoria_mb"] = metricas["memoria_pico"] / 1e6
+    final.columns.name = None
+
+    return final
+
+
+def guardar_reporte(df, ruta):
+    """
+    Guarda el resumen de una ejecución en formato JSON o CSV.
+
+    El formato se escoge según la extensión del archivo.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El resumen generado por resumen().
+
+    ruta : str
+        La ruta del archivo, con extensión .json o .csv.
+
+    """
+
+    if ruta.endswith(".json"):
+        df.reset_index().to_json(ruta, orient="records", indent=4, force_ascii=False)
+    else:
+        df.to_csv(ruta, encoding="utf-8")
+
+
+def imprimir_tabla(df, archivo=sys.stderr):
+    """
+    Imprime el resumen de una ejecución como tabla.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El resumen generado por resumen().
+
+    archivo : file
+        El archivo donde se imprime la tabla. Por defecto la salida de errores.
+
+    """
+
+    # El número de filas se muestra sin decimales.
+    formatos = [""] + [",.0f" if col == "filas" else ",.3f" for col in df.columns]
+
+    print(df.to_markdown(floatfmt=formatos), file=archivo)
@@ -0,0 +1,256 @@
+"""
+Este módulo prepara el PIB estatal del INEGI para consultarlo sin leer el CSV.
+
+El archivo assets/pib_estatal.csv tiene un registro por año, entidad y
+actividad económica (industria). Casi siempre solo se necesita el PIB
+total de cada entidad, por lo que el CSV se convierte en arreglos de
+NumPy guardados en la carpeta assets/pib:
+
+    - corriente.npy y constante.npy: matrices de entidades por años
+      con el PIB total a precios corrientes y constantes.
+    - cubo_corriente.npy y cubo_constante.npy: cubos de industrias por
+      entidades por años con todas las actividades económicas. Se abren
+      como memoria mapeada, por lo que solo se leen las partes usadas.
+    - indice.json: los años, las entidades y las industrias de cada eje.
+
+Las matrices se leen una sola vez por proceso y se conservan en memoria
+como arreglos de solo lectura. Cada llamada a cargar_pib() regresa un
+DataFrame nuevo con las entidades como índice y los años como columnas,
+así el PIB de un año o de todos los años se obtiene sin volver a leer
+ningún archivo y sin alterar la versión en memoria.
+"""
+
+import copy
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from puntos_control import archivo_temporal
+
+
+# Archivo original del INEGI.
+RUTA_PIB = "./assets/pib_estatal.csv"
+
+# Carpeta donde se guardan los arreglos.
+CARPETA_PIB = "./assets/pib"
+
+# Columna del CSV que corresponde a cada tipo de precios.
+PRECIOS = {"corriente": "VALOR_CORRIENTE", "constante": "VALOR_CONSTANTE"}
+
+# Clave de industria del PIB total.
+CLAVE_TOTAL = "PIB"
+
+
+def generar_matrices(ruta=RUTA_PIB, carpeta=CARPETA_PIB):
+    """
+    Convierte el CSV del PIB estatal en matrices y cubos de NumPy.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta del CSV del PIB estatal.
+
+    carpeta : str
+        La carpeta donde se guardan los arreglos.
+
+    Returns
+    -------
+    int
+        El número de registros del CSV.
+
+    """
+
+    df = pd.read_csv(ruta, dtype={"CLAVE_INDUSTRIA": str})
+
+    industrias = df.drop_duplicates("CLAVE_INDUSTRIA")
+    entidades = df.drop_duplicates("CVE_ENT").sort_values("CVE_ENT")
+    años = sorted(df["PERIODO"].unique())
+
+    # Posición de cada registro en cada eje del cubo.
+    i = pd.Index(industrias["CLAVE_INDUSTRIA"]).get_indexer(df["CLAVE_INDUSTRIA"])
+    j = pd.Index(entidades["CVE_ENT"]).get_indexer(df["CVE_ENT"])
+    k = pd.Index(años).get_indexer(df["PERIODO"])
+
+    os.makedirs(carpeta, exist_ok=True)
+
+    for precios, columna in PRECIOS.items():
+        # Las combinaciones sin registro quedan como nulos.
+        cubo = np.full((len(industrias), len(entidades), len(años)), np.nan)
+        cubo[i, j, k] = df[columna].to_numpy()
+
+        total = cubo[industrias["CLAVE_INDUSTRIA"].tolist().index(CLAVE_TOTAL)]
+
+        for nombre, arreglo in [(precios, total), (f"cubo_{precios}", cubo)]:
+            ruta_arreglo = os.path.join(carpeta, f"{nombre}.npy")
+
+            with archivo_temporal(ruta_arreglo) as temporal:
+                with open(temporal, "wb") as archivo:
+                    np.save(archivo, arreglo)
+
+    indice = {
+        "años": [int(año) for año in años],
+        "entidades": dict(
+            zip(entidades["CVE_ENT"].astype(str), entidades["ENTIDAD"])
+        ),
+        "industrias": dict(
+            zip(industrias["CLAVE_INDUSTRIA"], industrias["INDUSTRIA"])
+        ),
+    }
+
+    # El índice se escribe al final, su fecha indica que los arreglos están completos.
+    with archivo_temporal(os.path.join(carpeta, "indice.json")) as temporal:
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(indice, archivo, ensure_ascii=False, indent=4)
+
+    return len(df)
+
+
+@lru_cache(maxsize=None)
+def leer_indice():
+    """
+    Lee los ejes de los arreglos del PIB.
+
+    Si los arreglos no existen o son más antiguos que el CSV, se generan.
+
+    Returns
+    -------
+    dict
+        Diccionario con los años, las entidades (clave y nombre)
+        y las industrias (clave y nombre), compartido por todas
+        las llamadas.
+
+    """
+
+    ruta = os.path.join(CARPETA_PIB, "indice.json")
+
+    if not os.path.exists(ruta) or os.path.getmtime(ruta) < os.path.getmtime(RUTA_PIB):
+        generar_matrices()
+
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def cargar_indice():
+    """
+    Carga los ejes de los arreglos del PIB.
+
+    Returns
+    -------
+    dict
+        Una copia de leer_indice().
+
+    """
+
+    return copy.deepcopy(leer_indice())
+
+
+@lru_cache(maxsize=None)
+def leer_matriz(precios="corriente"):
+    """
+    Lee la matriz del PIB total de cada entidad y año.
+
+    Parameters
+    ----------
+    precios : str
+        Puede ser 'corriente' o 'constante'.
+
+    Returns
+    -------
+    numpy.ndarray
+        Arreglo de solo lectura con forma (entidades, años),
+        compartido por todas las llamadas.
+
+    """
+
+    leer_indice()
+
+    matriz = np.load(os.path.join(CARPETA_PIB, f"{precios}.npy"))
+    matriz.setflags(write=False)
+
+    return matriz
+
+
+def cargar_pib(precios="corriente"):
+    """
+    Carga el PIB total de cada entidad y año.
+
+    Parameters
+    ----------
+    precios : str
+        Puede ser 'corriente' o 'constante'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El PIB en millones de pesos, con el nombre de las entidades
+        (incluyendo 'Nacional') como índice y los años como columnas.
+
+    """
+
+    indice = leer_indice()
+
+    return pd.DataFrame(
+        leer_matriz(precios),
+        index=pd.Index(indice["entidades"].values(), name="ENTIDAD"),
+        columns=pd.Index(indice["años"], name="PERIODO"),
+        copy=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def cargar_cubo(precios="corriente"):
+    """
+    Abre el cubo del PIB por industria, entidad y año como memoria mapeada.
+
+    Los ejes del cubo están en el mismo orden que en cargar_indice().
+    El arreglo es compartido por todas las llamadas, pero al abrirse
+    en modo de solo lectura no se puede modificar.
+
+    Parameters
+    ----------
+    precios : str
+        Puede ser 'corriente' o 'constante'.
+
+    Returns
+    -------
+    numpy.memmap
+        Arreglo de solo lectura con forma (industrias, entidades, años).
+
+    """
+
+    leer_indice()
+
+    return np.load(os.path.join(CARPETA_PIB, f"cubo_{precios}.npy"), mmap_mode="r")
+
+
+def pib_industria(clave, precios="corriente"):
+    """
+    Obtiene el valor de una industria para cada entidad y año.
+
+    Parameters
+    ----------
+    clave : str
+        La clave de la industria, por ejemplo 'PIB', 'VAB' o '11'.
+
+    precios : str
+        Puede ser 'corriente' o 'constante'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Los valores en millones de pesos, con el nombre de las
+        entidades como índice y los años como columnas.
+
+    """
+
+    indice = leer_indice()
+    posicion = list(indice["industrias"]).index(clave)
+
+    return pd.DataFrame(
+        np.array(cargar_cubo(precios)[posicion]),
+        index=pd.Index(indice["entidades"].values(), name="ENTIDAD"),
+        columns=pd.Index(indice["años"], name="PERIODO"),
+    )
@@ -0,0 +1,292 @@
+"""
+Este módulo centraliza la población municipal estimada por el CONAPO.
+
+El archivo assets/poblacion.csv tiene una columna por año. Aquí se lee
+una sola vez por proceso y se guarda como tablas indexadas por clave y
+año, junto con los totales por entidad y nacionales ya calculados:
+
+    - municipal: una fila por municipio, con su clave (CVE) como índice.
+    - estatal: una fila por entidad, con su nombre como índice.
+    - nacional: una sola fila llamada 'Nacional'.
+
+Las columnas de las tres tablas son los años, por lo que la población de
+un año se obtiene como una columna y la de un municipio o entidad con
+una búsqueda en el índice. Los municipios también se pueden buscar por
+su nombre con el formato 'Municipio, Entidad'.
+
+Las tablas se conservan en memoria y cada llamada a las funciones
+cargar_* y obtener_poblacion() regresa una copia, por lo que se puede
+modificar sin alterar la versión en memoria.
+
+Las estimaciones del CONAPO corresponden a mitad de año, por lo que la
+población trimestral se interpola linealmente entre el 1 de julio de
+cada año.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+import pandas as pd
+
+
+# Archivo original del CONAPO.
+RUTA_POBLACION = "./assets/poblacion.csv"
+
+# Niveles geográficos disponibles.
+NIVELES = ["municipal", "estatal", "nacional"]
+
+
+def leer_poblacion():
+    """
+    Lee la población municipal del CONAPO en formato largo.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Un registro por municipio y año.
+
+    """
+
+    df = pd.read_csv(RUTA_POBLACION, dtype={"CVE": str})
+
+    df = df.melt(
+        id_vars=["CVE", "Entidad", "Municipio"],
+        var_name="PERIODO",
+        value_name="POBLACION",
+    )
+
+    df = df.rename(columns={"Entidad": "ENTIDAD", "Municipio": "MUNICIPIO"})
+    df["PERIODO"] = pd.to_datetime(df["PERIODO"], format="%Y").astype(
+        "datetime64[ns]"
+    )
+
+    return df[["PERIODO", "CVE", "ENTIDAD", "MUNICIPIO", "POBLACION"]]
+
+
+@lru_cache(maxsize=None)
+def leer_catalogo():
+    """
+    Lee la entidad, el municipio y el nombre completo de cada clave.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Las columnas ENTIDAD, MUNICIPIO y NOMBRE ('Municipio, Entidad')
+        con la clave del municipio como índice, compartido por todas
+        las llamadas.
+
+    """
+
+    df = pd.read_csv(
+        RUTA_POBLACION, dtype=str, usecols=["CVE", "Entidad", "Municipio"]
+    ).set_index("CVE")
+
+    df.columns = ["ENTIDAD", "MUNICIPIO"]
+    df["NOMBRE"] = df["MUNICIPIO"] + ", " + df["ENTIDAD"]
+
+    return df
+
+
+def cargar_catalogo():
+    """
+    Carga la entidad, el municipio y el nombre completo de cada clave.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una copia de leer_catalogo().
+
+    """
+
+    return leer_catalogo().copy()
+
+
+@lru_cache(maxsize=None)
+def leer_tabla(nivel="municipal"):
+    """
+    Lee la población anual de un nivel geográfico.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'municipal', 'estatal' o 'nacional'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        La población con los años como columnas, compartida
+        por todas las llamadas.
+
+    """
+
+    if nivel == "municipal":
+        df = pd.read_csv(RUTA_POBLACION, dtype={"CVE": str}, index_col="CVE")
+        df = df.drop(columns=["Entidad", "Municipio"])
+        df.columns = df.columns.astype(int)
+        return df
+
+    municipal = leer_tabla("municipal")
+
+    if nivel == "estatal":
+        return municipal.groupby(leer_catalogo()["ENTIDAD"]).sum()
+
+    if nivel == "nacional":
+        return municipal.sum().to_frame("Nacional").T
+
+    raise ValueError(f"Nivel desconocido: {nivel}. Puede ser {NIVELES}.")
+
+
+def cargar_poblacion(nivel="municipal"):
+    """
+    Carga la población anual de un nivel geográfico.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'municipal', 'estatal' o 'nacional'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una copia de leer_tabla().
+
+    """
+
+    return leer_tabla(nivel).copy()
+
+
+@lru_cache(maxsize=None)
+def interpolar_trimestres(nivel="municipal"):
+    """
+    Interpola la población anual al inicio de cada trimestre.
+
+    La población de cada año se asigna al 1 de julio y los trimestres
+    intermedios se interpolan linealmente.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'municipal', 'estatal' o 'nacional'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        La población con el inicio de cada trimestre como índice y las
+        claves o nombres del nivel como columnas, compartida por todas
+        las llamadas.
+
+    """
+
+    df = leer_tabla(nivel).T
+    df.index = pd.to_datetime([f"{año}-07-01" for año in df.index])
+
+    trimestres = pd.date_range(df.index.min(), df.index.max(), freq="QS")
+
+    return df.astype(float).reindex(trimestres).interpolate(method="time")
+
+
+def cargar_poblacion_trimestral(nivel="municipal"):
+    """
+    Carga la población al inicio de cada trimestre.
+
+    Parameters
+    ----------
+    nivel : str
+        Puede ser 'municipal', 'estatal' o 'nacional'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Una copia de interpolar_trimestres().
+
+    """
+
+    return interpolar_trimestres(nivel).copy()
+
+
+def obtener_poblacion(año, nivel="municipal", indice="CVE"):
+    """
+    Obtiene la población de un año para todo un nivel geográfico.
+
+    Parameters
+    ----------
+    año : int
+        El año que nos interesa.
+
+    nivel : str
+        Puede ser 'municipal', 'estatal' o 'nacional'.
+
+    indice : str
+        Solo para el nivel municipal. Puede ser 'CVE' para usar la clave
+        del municipio o 'NOMBRE' para usar 'Municipio, Entidad'.
+
+    Returns
+    -------
+    pandas.Series
+        La población de cada municipio, entidad o del país.
+
+    """
+
+    poblacion = leer_tabla(nivel)[año].copy()
+
+    if indice == "NOMBRE":
+        poblacion = poblacion.set_axis(leer_catalogo()["NOMBRE"])
+
+    return poblacion
+
+
+def buscar_poblacion(llave, año):
+    """
+    Busca la población de un municipio, una entidad o del país.
+
+    Parameters
+    ----------
+    llave : str
+        La clave de un municipio (por ejemplo '14039'), su nombre
+        ('Guadalajara, Jalisco'), el nombre de una entidad o 'Nacional'.
+
+    año : int
+        El año que nos interesa.
+
+    Returns
+    -------
+    int
+        La población estimada.
+
+    Raises
+    ------
+    KeyError
+        Si la llave no corresponde a ningún municipio ni entidad.
+
+    """
+
+    for nivel in NIVELES:
+        tabla = leer_tabla(nivel)
+
+        if llave in tabla.index:
+            return tabla.at[llave, año]
+
+    claves = claves_por_nombre()
+
+    if llave in claves:
+        return leer_tabla("municipal").at[claves[llave], año]
+
+    raise KeyError(f"No se encontró la población de {llave}")
+
+
+@lru_cache(maxsize=None)
+def claves_por_nombre():
+    """
+    Regresa la clave de cada municipio a partir de su nombre.
+
+    Returns
+    -------
+    mappingproxy
+        Diccionario de solo lectura con 'Municipio, Entidad' como llave
+        y la clave como valor.
+
+    """
+
+    catalogo = leer_catalogo()
+
+    return MappingProxyType(dict(zip(catalogo["NOMBRE"], catalogo.index)))
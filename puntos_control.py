@@ -0,0 +1,108 @@
+"""
+Este módulo permite reanudar el ETL después de una falla parcial.
+
+El ETL tiene tres puntos de control:
+
+    1. Los archivos crudos del SIE, guardados en caché por descargas.py.
+    2. Los cuadros ya interpretados, guardados aquí en formato pickle
+       con un hash del archivo crudo, del nombre de la función que lo
+       interpreta y de su versión como parte del nombre.
+    3. Los archivos finales de data/ y assets/, cuya huella registra
+       grafo.py al terminar cada etapa.
+
+Si una etapa falla, al volver a ejecutar el ETL no se descargan los
+cuadros vigentes, no se vuelven a interpretar los cuadros que ya fueron
+leídos y se omiten las etapas que terminaron correctamente.
+
+Todas las escrituras se hacen primero en un archivo temporal que después
+reemplaza al archivo final, de modo que nunca queda un archivo a medias.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+from contextlib import contextmanager
+
+
+# Carpeta donde se guardan los cuadros ya interpretados.
+CARPETA_CUADROS = "./cache/cuadros"
+
+
+@contextmanager
+def archivo_temporal(ruta):
+    """
+    Regresa una ruta temporal que reemplaza a la ruta final al terminar.
+
+    El archivo temporal se crea en la misma carpeta, por lo que el
+    reemplazo es atómico. Si ocurre un error, el archivo final no se
+    modifica y el temporal se elimina.
+
+    Parameters
+    ----------
+    ruta : str
+        La ruta final del archivo.
+
+    """
+
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+
+    try:
+        yield temporal
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def leer_con_punto_control(cuadro, contenido, lector, version=1):
+    """
+    Interpreta un cuadro o recupera el resultado de una ejecución anterior.
+
+    Parameters
+    ----------
+    cuadro : str
+        El ID del cuadro.
+
+    contenido : bytes
+        El contenido crudo del cuadro.
+
+    lector : callable
+        La función que interpreta el contenido crudo.
+
+    version : int
+        La versión de la función lector. Se debe incrementar cada vez que
+        cambia su resultado para no recuperar puntos de control obsoletos.
+
+    Returns
+    -------
+    object
+        El resultado de la función lector.
+
+    """
+
+    # La huella cambia si cambia el contenido, la función lector o su versión.
+    # No se usa el módulo de la función porque es '__main__' al ejecutar etl.py.
+    huella = hashlib.sha256(contenido)
+    huella.update(f"{lector.__qualname__}:{version}".encode())
+    huella = huella.hexdigest()[:16]
+
+    ruta = os.path.join(CARPETA_CUADROS, f"{cuadro}_{huella}.pkl")
+
+    if os.path.exists(ruta):
+        with open(ruta, "rb") as archivo:
+            return pickle.load(archivo)
+
+    resultado = lector(contenido)
+
+    # Eliminamos los puntos de control de versiones anteriores del cuadro.
+    for anterior in glob.glob(os.path.join(CARPETA_CUADROS, f"{cuadro}_*.pkl")):
+        os.remove(anterior)
+
+    os.makedirs(CARPETA_CUADROS, exist_ok=True)
+
+    with archivo_temporal(ruta) as temporal:
+        with open(temporal, "wb") as archivo:
+            pickle.dump(resultado, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return resultado
@@ -5,22 +5,24 @@ https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?sect
 
 """
 
-import json
 import os
 
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
 from PIL import Image
 from plotly.subplots import make_subplots
 
+from consultas import consultar
+from datos import cargar
+from geometrias import obtener_geojson
+from inflacion import deflactar, describir_fecha
+from pib import cargar_pib
+from poblacion import obtener_poblacion
+
 
 # Mes y año en que se recopilaron los datos.
 FECHA_FUENTE = "julio 2026"
 
-# Mes y año del IPC de referencia.
-FECHA_INFLACION = "junio de 2026"
-
 # Periodo de tiempo del análisis.
 PERIODO_TIEMPO = "enero-diciembre"
 
@@ -30,43 +32,6 @@ PAPER_COLOR = "#262B23"
 HEADER_COLOR = "#C25B42"
 
 
-def cargar_deflactadores(modo):
-    """
-    Carga las series de tiempo del IPC y tipo de cambio
-    en un solo DataFrame.
-
-    Esto es utilizado para ajustar las remesas por inflación.
-
-    Parameters
-    ----------
-    modo : str
-        Puede ser 'mensual' o 'trimestral'.
-
-    """
-
-    # Cargamos el dataset del IPC.
-    ipc = pd.read_csv("./assets/IPC.csv", parse_dates=["PERIODO"], index_col=0)
-
-    # Escogemos un IPC de referencia (el más reciente).
-    ipc_referencia = ipc["GENERAL"].iloc[-1]
-
-    # Calculamos el factor.
-    ipc["factor"] = ipc_referencia / ipc["GENERAL"]
-
-    # Cargamos el dataset del tipo de cambio.
-    fx = pd.read_csv("./assets/USDMXN.csv", parse_dates=["PERIODO"], index_col=0)
-
-    # Unimos ambos DataFrames y quitamos las filas incompletas.
-    df = pd.concat([ipc["factor"], fx], axis=1).dropna(axis=0)
-
-    # Si la modalidad es mensual, regresamos el DataFrame tal cual.
-    # Si es trimestral, hacemos remuestreo usando el promedio trimestral.
-    if modo == "mensual":
-        return df
-    elif modo == "trimestral":
-        return df.resample("QS").mean()
-
-
 def plot_mapa(año):
     """
     Esta función crea un mapa y unas tablas con la información de remesas per cápita.
@@ -78,23 +43,14 @@ def plot_mapa(año):
 
     """
 
-    # Cargamos el dataset de la polación total estimada según el CONAPO.
-    pop = pd.read_csv("./assets/poblacion.csv")
-
-    # Calculamos la población total por entidad.
-    pop = pop.groupby("Entidad").sum(numeric_only=True)
+    # Seleccionamos la población total por entidad del año de nuestro interés.
+    pop = obtener_poblacion(año, "estatal")
 
-    # Seleccionamos la población del año de nuestro interés.
-    pop = pop[str(año)]
-
-    # Cargamos el dataset de remesas por entidad.
-    df = pd.read_csv("./data/remesas_entidad.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
+    # Consultamos las remesas por entidad del año especificado.
+    df = consultar("remesas_entidad_anual", año, año)
 
     # Calculamos el total por entidad.
-    df = df.groupby("ENTIDAD").sum(numeric_only=True)
+    df = df.groupby("ENTIDAD", observed=True).sum(numeric_only=True)
 
     # Calculamos las remesas per cápita para toda la polación.
     subtitulo = (
@@ -117,8 +73,8 @@ def plot_mapa(año):
     marcas = np.linspace(valor_min, valor_max, 11)
     etiquetas = [f"{item:,.0f}" for item in marcas]
 
-    # Cargamos el archivo GeoJSON de México.
-    geojson = json.loads(open("./assets/mexico.json", "r", encoding="utf-8").read())
+    # Cargamos el GeoJSON de México con la resolución adecuada para el ancho de la imagen.
+    geojson = obtener_geojson("estatal", 1920)
 
     fig = go.Figure()
 
@@ -338,13 +294,8 @@ def comparacion_interanual(primer_año, segundo_año):
 
     """
 
-    # Cargamos el dataset de remesas por entidad.
-    df = pd.read_csv("./data/remesas_entidad.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los años dentro de nuestro rango de interés.
-    df = df[
-        (df["PERIODO"].dt.year >= primer_año) & (df["PERIODO"].dt.year <= segundo_año)
-    ]
+    # Consultamos las remesas por entidad del rango de años indicado.
+    df = consultar("remesas_entidad_anual", primer_año, segundo_año)
 
     # Convertimos las cifras a millones de dólares.
     df["VALOR_USD"] /= 1000000
@@ -355,6 +306,7 @@ def comparacion_interanual(primer_año, segundo_año):
         columns=df["PERIODO"].dt.year,
         values="VALOR_USD",
         aggfunc="sum",
+        observed=True,
     )
 
     # Calculamos el total nacional.
@@ -517,7 +469,7 @@ def plot_tendencias(primer_año, ultimo_año, orden):
     """
 
     # Cargamos el dataset de remesas por entidad.
-    df = pd.read_csv("./data/remesas_entidad.csv", parse_dates=["PERIODO"])
+    df = cargar("remesas_entidad")
 
     # Seleccionamos los años dentro de nuestro rango de interés.
     df = df[
@@ -530,17 +482,12 @@ def plot_tendencias(primer_año, ultimo_año, orden):
         columns="ENTIDAD",
         values="VALOR_USD",
         aggfunc="sum",
+        observed=True,
     )
 
-    # Cargamos el IPC y el tipo de cambio trimestral.
-    ipc_fx = cargar_deflactadores("trimestral")
-    
-    # Preparamos el coeficiente de deflactación para cada trimestre.
-    ipc_fx = ipc_fx["TIPO_CAMBIO"] * ipc_fx["factor"]
-
-    # Deflactamos cada entidad y convertimos las cifras en millones de pesos.
-    for col in df.columns:
-        df[col] = df[col] * ipc_fx / 1000000
+    # Deflactamos todas las entidades y convertimos las cifras en millones de pesos.
+    df, fecha = deflactar(df, "QS")
+    df /= 1000000
 
     # Remuestreamos con la suma anual.
     df = df.resample("YS").sum()
@@ -558,17 +505,14 @@ def plot_tendencias(primer_año, ultimo_año, orden):
     # Calculamos el cambio nacional.
     cambio = (df[ultimo_año].sum() - df[primer_año].sum()) / df[primer_año].sum() * 100
 
-    # Quitamos los municipsios con valores infinitos.
-    df = df[df["change"] != np.inf]
-
     # Ordenamos el DataFrame de acuerdo al valor del parámetro 'orden'.
     # Aprovechamos para ajustar el título del gráfico.
     if orden == "top":
         df.sort_values("change", ascending=False, inplace=True)
-        titulo = f"Las 15 entidades de México con <b>mayor</b> crecimiento real en ingresos por remesas ({primer_año} vs. {ultimo_año})<br>(cifras en millones de pesos a precios constantes de {FECHA_INFLACION})"
+        titulo = f"Las 15 entidades de México con <b>mayor</b> crecimiento real en ingresos por remesas ({primer_año} vs. {ultimo_año})<br>(cifras en millones de pesos a precios constantes de {describir_fecha(fecha)})"
     elif orden == "bottom":
         df.sort_values("change", ascending=True, inplace=True)
-        titulo = f"Las 15 entidades de México con <b>menor</b> crecimiento real en ingresos por remesas ({primer_año} vs. {ultimo_año})<br>(cifras en millones de pesos a precios constantes de {FECHA_INFLACION})"
+        titulo = f"Las 15 entidades de México con <b>menor</b> crecimiento real en ingresos por remesas ({primer_año} vs. {ultimo_año})<br>(cifras en millones de pesos a precios constantes de {describir_fecha(fecha)})"
 
     # Esta lista contendrá los textos de cada anotación.
     texto_anotaciones = list()
@@ -796,26 +740,17 @@ def comparar_pib(año):
 
     """
 
-    # Cargamos el dataset del PIB por entidad.
-    pib = pd.read_csv("./assets/pib_estatal.csv")
-
-    # Seleccionamos los datos del año que nos interesa.
-    pib = pib[pib["PERIODO"] == año]
-
-    # Seleccionamos los datos del PIB total.
-    pib = pib[pib["CLAVE_INDUSTRIA"] == "PIB"]
-
-    # Vamos a utilizar los valores corrientes.
-    pib = pib.groupby("ENTIDAD").last()["VALOR_CORRIENTE"] * 1000000
+    # Seleccionamos el PIB total a precios corrientes del año que nos interesa.
+    pib = cargar_pib("corriente")[año] * 1000000
 
     # Cargamos el dataset del tipo de cambio.
-    fx = pd.read_csv("./assets/USDMXN.csv", parse_dates=["PERIODO"], index_col=0)
+    fx = cargar("USDMXN", indice="PERIODO")
 
     # Remuestramos por promedio trimestral.
     fx = fx.resample("QS").mean()
 
     # Cargamos el dataset de remesas por entidad.
-    df = pd.read_csv("./data/remesas_entidad.csv", parse_dates=["PERIODO"], index_col=0)
+    df = cargar("remesas_entidad", indice="PERIODO")
 
     # Seleccionamos los reigstros del año especificado.
     df = df[df.index.year == año]
@@ -827,7 +762,7 @@ def comparar_pib(año):
     df["pesos"] = df["VALOR_USD"] * df["cambio"]
 
     # Agrupamos por entidad.
-    df = df.groupby("ENTIDAD").sum()
+    df = df.groupby("ENTIDAD", observed=True).sum()
 
     # Calculamos el total anual.
     df.loc["Nacional"] = df.sum(axis=0)
@@ -12,59 +12,21 @@ https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?acci
 
 """
 
-import pandas as pd
 import plotly.graph_objects as go
 from statsmodels.tsa.seasonal import STL
 
+from datos import cargar, cargar_deflactores
+from inflacion import deflactar, describir_fecha
+
 
 # Mes y año en que se recopilaron los datos.
 FECHA_FUENTE = "julio 2026"
 
-# Mes y año del IPC de referencia.
-FECHA_INFLACION = "junio de 2026"
-
 # Paleta de colores para todas las gráficas.
 PLOT_COLOR = "#1C1F1A"
 PAPER_COLOR = "#262B23"
 
 
-def cargar_deflactadores(modo):
-    """
-    Carga las series de tiempo del IPC y tipo de cambio
-    en un solo DataFrame.
-
-    Esto es utilizado para ajustar las remesas por inflación.
-
-    Parameters
-    ----------
-    modo : str
-        Puede ser 'mensual' o 'trimestral'.
-
-    """
-
-    # Cargamos el dataset del IPC.
-    ipc = pd.read_csv("./assets/IPC.csv", parse_dates=["PERIODO"], index_col=0)
-
-    # Escogemos un IPC de referencia (el más reciente).
-    ipc_referencia = ipc["GENERAL"].iloc[-1]
-
-    # Calculamos el factor.
-    ipc["factor"] = ipc_referencia / ipc["GENERAL"]
-
-    # Cargamos el dataset del tipo de cambio.
-    fx = pd.read_csv("./assets/USDMXN.csv", parse_dates=["PERIODO"], index_col=0)
-
-    # Unimos ambos DataFrames y quitamos las filas incompletas.
-    df = pd.concat([ipc["factor"], fx], axis=1).dropna(axis=0)
-
-    # Si la modalidad es mensual, regresamos el DataFrame tal cual.
-    # Si es trimestral, hacemos remuestreo usando el promedio trimestral.
-    if modo == "mensual":
-        return df
-    elif modo == "trimestral":
-        return df.resample("QS").mean()
-
-
 def plot_mensuales(flujo):
     """
     Crea una gráfica de barras con las cifras mensuales de remesas en dólares nominales.
@@ -78,9 +40,7 @@ def plot_mensuales(flujo):
     """
 
     # Cargamos el dataset de las remesas mensuales.
-    df = pd.read_csv(
-        "./data/remesas_mensuales.csv", parse_dates=["PERIODO"], index_col=0
-    )
+    df = cargar("remesas_mensuales", indice="PERIODO")
 
     # Seleccionamos solo los registros del tipo de flujo indicado.
     df = df[df["FLUJO"] == flujo]
@@ -89,7 +49,7 @@ def plot_mensuales(flujo):
     df["VALOR_USD"] /= 1000000
 
     # Calculamos el total de remesas por año para los últimos 10 años.
-    por_año = df.resample("YS").sum().tail(10)
+    por_año = df.resample("YS").sum(numeric_only=True).tail(10)
 
     # Vamos a crear una tabla con los totales.
     tabla = "<b>Total por año (MDD)</b>"
@@ -251,9 +211,7 @@ def plot_pesos(flujo):
     """
 
     # Cargamos el dataset de las remesas mensuales.
-    df = pd.read_csv(
-        "./data/remesas_mensuales.csv", parse_dates=["PERIODO"], index_col=0
-    )
+    df = cargar("remesas_mensuales", indice="PERIODO")
 
     # Seleccionamos solo los registros del tipo de flujo indicado.
     df = df[df["FLUJO"] == flujo]
@@ -262,14 +220,14 @@ def plot_pesos(flujo):
     df["VALOR_USD"] /= 1000000
 
     # Cargamos factor de inflación y tipo de cambio mensual.
-    df = df.join(cargar_deflactadores("mensual"))
+    df = df.join(cargar_deflactores())
 
     # Hacemos la conversión a pesos corrientes.
     # Para esta función no ajustaremos por inflación.
     df["pesos"] = df["VALOR_USD"] * df["TIPO_CAMBIO"]
 
     # Calculamos el total de remesas por año para los últimos 10 años.
-    por_año = df.resample("YS").sum().tail(10)
+    por_año = df.resample("YS").sum(numeric_only=True).tail(10)
 
     # Vamos a crear una tabla con los totales.
     tabla = "<b>Total por año (MDP)</b>"
@@ -431,9 +389,7 @@ def plot_real(flujo):
     """
 
     # Cargamos el dataset de las remesas mensuales.
-    df = pd.read_csv(
-        "./data/remesas_mensuales.csv", parse_dates=["PERIODO"], index_col=0
-    )
+    df = cargar("remesas_mensuales", indice="PERIODO")
 
     # Seleccionamos solo los registros del tipo de flujo indicado.
     df = df[df["FLUJO"] == flujo]
@@ -441,14 +397,11 @@ def plot_real(flujo):
     # Convertimos las cifras a millones de dólares.
     df["VALOR_USD"] /= 1000000
 
-    # Cargamos factor de inflación y tipo de cambio mensual.
-    df = df.join(cargar_deflactadores("mensual"))
-
     # Ajustamos por inflación y tipo de cambio para obtener pesos reales.
-    df["real"] = df["VALOR_USD"] * df["factor"] * df["TIPO_CAMBIO"]
+    df["real"], fecha = deflactar(df["VALOR_USD"])
 
     # Calculamos el total de remesas por año para los últimos 10 años.
-    por_año = df.resample("YS").sum().tail(10)
+    por_año = df.resample("YS").sum(numeric_only=True).tail(10)
 
     # Vamos a crear una tabla con los totales.
     tabla = "<b>Total por año (MDP)</b>"
@@ -510,7 +463,7 @@ def plot_real(flujo):
     )
 
     fig.update_yaxes(
-        title=f"Millones de pesos constantes (base, {FECHA_INFLACION})",
+        title=f"Millones de pesos constantes (base, {describir_fecha(fecha)})",
         tickformat="s",
         separatethousands=True,
         ticks="outside",
@@ -610,21 +563,16 @@ def plot_real_anual(flujo):
     """
 
     # Cargamos el dataset de las remesas mensuales.
-    df = pd.read_csv(
-        "./data/remesas_mensuales.csv", parse_dates=["PERIODO"], index_col=0
-    )
+    df = cargar("remesas_mensuales", indice="PERIODO")
 
     # Seleccionamos solo los registros del tipo de flujo indicado.
     df = df[df["FLUJO"] == flujo]
 
-    # Cargamos factor de inflación y tipo de cambio mensual.
-    df = df.join(cargar_deflactadores("mensual"))
-
     # Ajustamos por inflación y tipo de cambio para obtener pesos reales.
-    df["real"] = df["VALOR_USD"] * df["factor"] * df["TIPO_CAMBIO"]
+    df["real"], fecha = deflactar(df["VALOR_USD"])
 
     # Calculamos el total de remesas por año.
-    df = df.resample("YS").sum()
+    df = df.resample("YS").sum(numeric_only=True)
 
     # Cambiamos de fecha a integral para el índice.
     df.index = df.index.year
@@ -635,14 +583,14 @@ def plot_real_anual(flujo):
     # El título cambia dependiendo el flujo.
     if flujo == "Ingresos":
         titulo = f"Evolución de los ingresos anuales reales por remesas hacia México ({df.index.min()}-{df.index.max()})"
-        titulo_y = f"Billones de pesos a precios constantes de {FECHA_INFLACION}"
+        titulo_y = f"Billones de pesos a precios constantes de {describir_fecha(fecha)}"
 
         # Convertimos las cifras a billones de pesos.
         df["real"] /= 1000000000000
         plantilla = "%{text:,.3f}"
     elif flujo == "Egresos":
         titulo = f"Evolución de los egresos anuales reales por remesas desde México ({df.index.min()}-{df.index.max()})"
-        titulo_y = f"Millones de pesos a precios constantes de {FECHA_INFLACION}"
+        titulo_y = f"Millones de pesos a precios constantes de {describir_fecha(fecha)}"
 
         # Convertimos las cifras a millones de pesos.
         df["real"] /= 1000000
@@ -728,7 +676,7 @@ def plot_real_anual(flujo):
                 font_size=22,
                 bgcolor=PLOT_COLOR,
                 align="left",
-                text=f"<b>Metodología:</b><br>Se convirtieron los dólares a pesos utilizando<br>el tipo de cambio de cada mes, se ajustó por<br>inflación a valores de {FECHA_INFLACION} y se<br>agruparon los resultados de forma anual.",
+                text=f"<b>Metodología:</b><br>Se convirtieron los dólares a pesos utilizando<br>el tipo de cambio de cada mes, se ajustó por<br>inflación a valores de {describir_fecha(fecha)} y se<br>agruparon los resultados de forma anual.",
             ),
             dict(
                 x=0.01,
@@ -777,18 +725,13 @@ def remesa_promedio(flujo):
     """
 
     # Cargamos el dataset de las remesas mensuales.
-    df = pd.read_csv(
-        "./data/remesas_mensuales.csv", parse_dates=["PERIODO"], index_col=0
-    )
+    df = cargar("remesas_mensuales", indice="PERIODO")
 
     # Seleccionamos solo los registros del tipo de flujo indicado.
     df = df[df["FLUJO"] == flujo]
 
-    # Cargamos factor de inflación y tipo de cambio mensual.
-    df = df.join(cargar_deflactadores("mensual"))
-
     # Ajustamos por inflación y tipo de cambio para obtener pesos reales.
-    df["real"] = df["VALOR_USD"] * df["factor"] * df["TIPO_CAMBIO"]
+    df["real"], fecha = deflactar(df["VALOR_USD"])
 
     # Calculamos el valor promedio or operación.
     df["valor_promedio"] = df["real"] / df["OPERACIONES"]
@@ -857,7 +800,7 @@ def remesa_promedio(flujo):
     )
 
     fig.update_yaxes(
-        title=f"Pesos constantes (base, {FECHA_INFLACION})",
+        title=f"Pesos constantes (base, {describir_fecha(fecha)})",
         ticks="outside",
         ticklen=10,
         title_standoff=15,
@@ -5,13 +5,14 @@ https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?sect
 
 """
 
-import json
-
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from consultas import consultar
+from geometrias import obtener_geojson
+from poblacion import obtener_poblacion
+
 
 # Definimos los colores que usaremos para el mapa y tablas.
 PLOT_COLOR = "#1C1F1A"
@@ -37,24 +38,14 @@ def plot_mapa(año):
 
     """
 
-    # Cargamos el dataset de población por municipio.
-    pop = pd.read_csv("./assets/poblacion.csv", dtype={"CVE": str}, index_col=0)
-
-    # Seleccionamos la población del año especificado.
-    pop = pop[str(año)]
-
-    # Cargamos el dataset de remesas por municipio.
-    df = pd.read_csv(
-        "./data/remesas_municipio.csv",
-        parse_dates=["PERIODO"],
-        dtype={"CVE_GEO": str},
-    )
+    # Seleccionamos la población por municipio del año especificado.
+    pop = obtener_poblacion(año)
 
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
+    # Consultamos las remesas por municipio del año especificado.
+    df = consultar("remesas_municipio_anual", año, año)
 
     # Calculamos el total por municipio.
-    df = df.groupby("CVE_GEO").sum(numeric_only=True)
+    df = df.groupby("CVE_GEO", observed=True).sum(numeric_only=True)
 
     # Asignamos la población a cada municipio.
     df["pop"] = pop
@@ -97,8 +88,8 @@ def plot_mapa(año):
     # Agregamos el símbolo de igual o mayr que a la última etiqueta.
     etiquetas[-1] = f"≥{etiquetas[-1]}"
 
-    # Cargamos el archivo GeoJSON de México.
-    geojson = json.loads(open("./assets/municipios.json", "r", encoding="utf-8").read())
+    # Cargamos el GeoJSON de los municipios con la resolución adecuada para el ancho de la imagen.
+    geojson = obtener_geojson("municipal", 7680)
 
     fig = go.Figure()
 
@@ -139,9 +130,7 @@ def plot_mapa(año):
     # de las entidades federativas.
 
     # Cargamos el archivo GeoJSON de México.
-    geojson_borde = json.loads(
-        open("./assets/mexico.json", "r", encoding="utf-8").read()
-    )
+    geojson_borde = obtener_geojson("estatal", 7680)
 
     # Este mapa tiene mucho menos personalización.
     # Lo único que necesitamos es que muestre los contornos
@@ -257,23 +246,15 @@ def plot_capita(año):
 
     """
 
-    # Cargamos el dataset de población por municipio.
-    pop = pd.read_csv("./assets/poblacion.csv")
-
-    # El índice será el nombre del municipio y su entidad.
-    pop.index = pop["Municipio"] + ", " + pop["Entidad"]
-
     # Seleccionamos la población del año especificado.
-    pop = pop[str(año)]
-
-    # Cargamos el dataset de remesas por municipio.
-    df = pd.read_csv("./data/remesas_municipio.csv", parse_dates=["PERIODO"])
+    # El índice será el nombre del municipio y su entidad.
+    pop = obtener_poblacion(año, indice="NOMBRE")
 
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
+    # Consultamos las remesas por municipio del año especificado.
+    df = consultar("remesas_municipio_anual", año, año)
 
     # Creamos una nueva columna que después será el índice.
-    df["nombre"] = df["MUNICIPIO"] + ", " + df["ENTIDAD"]
+    df["nombre"] = df["MUNICIPIO"].astype(str) + ", " + df["ENTIDAD"].astype(str)
 
     # Calculamos el total por municipio.
     df = df.groupby("nombre").sum(numeric_only=True)
@@ -398,23 +379,15 @@ def plot_absolutos(año):
 
     """
 
-    # Cargamos el dataset de población por municipio.
-    pop = pd.read_csv("./assets/poblacion.csv")
-
-    # El índice será el nombre del municipio y su entidad.
-    pop.index = pop["Municipio"] + ", " + pop["Entidad"]
-
     # Seleccionamos la población del año especificado.
-    pop = pop[str(año)]
-
-    # Cargamos el dataset de remesas por municipio.
-    df = pd.read_csv("./data/remesas_municipio.csv", parse_dates=["PERIODO"])
+    # El índice será el nombre del municipio y su entidad.
+    pop = obtener_poblacion(año, indice="NOMBRE")
 
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
+    # Consultamos las remesas por municipio del año especificado.
+    df = consultar("remesas_municipio_anual", año, año)
 
     # Creamos una nueva columna que después será el índice.
-    df["nombre"] = df["MUNICIPIO"] + ", " + df["ENTIDAD"]
+    df["nombre"] = df["MUNICIPIO"].astype(str) + ", " + df["ENTIDAD"].astype(str)
 
     # Calculamos el total por municipio.
     df = df.groupby("nombre").sum(numeric_only=True)
@@ -543,16 +516,11 @@ def plot_tendencias(primer_año, ultimo_año):
 
     """
 
-    # Cargamos el dataset de remesas por municipio.
-    df = pd.read_csv("./data/remesas_municipio.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los años dentro de nuestro rango de interés.
-    df = df[
-        (df["PERIODO"].dt.year >= primer_año) & (df["PERIODO"].dt.year <= ultimo_año)
-    ]
+    # Consultamos las remesas por municipio del rango de años indicado.
+    df = consultar("remesas_municipio_anual", primer_año, ultimo_año)
 
     # Creamos una nueva columna que después será el índice.
-    df["nombre"] = df["MUNICIPIO"] + ", " + df["ENTIDAD"]
+    df["nombre"] = df["MUNICIPIO"].astype(str) + ", " + df["ENTIDAD"].astype(str)
 
     # Transformamos nuestro dataset para que el índice sean los municipios y las columnas los años.
     df = df.pivot_table(
@@ -560,6 +528,7 @@ def plot_tendencias(primer_año, ultimo_año):
         columns=df["PERIODO"].dt.year,
         values="VALOR_USD",
         aggfunc="sum",
+        observed=True,
     )
 
     # Convertimos las cifras a millones de dólares.
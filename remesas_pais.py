@@ -8,10 +8,11 @@ https://www.banxico.org.mx/SieInternet/consultarDirectorioInternetAction.do?acci
 """
 
 import numpy as np
-import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from consultas import consultar
+
 
 # Definimos los colores usados para todas las visualizaciones.
 PLOT_COLOR = "#1C1F1A"
@@ -39,17 +40,11 @@ def plot_top(año, flujo):
 
     """
 
-    # Cargamos el archivo CSV de remesas por país.
-    df = pd.read_csv("./data/remesas_pais.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
-
-    # Seleccionamos solo los registros del tipo de flujo indicado.
-    df = df[df["FLUJO"] == flujo]
+    # Consultamos las remesas por país del año y tipo de flujo indicados.
+    df = consultar("remesas_pais_anual", año, año, FLUJO=flujo)
 
     # Calculamos el total por país.
-    df = df.groupby("PAIS").sum(numeric_only=True)
+    df = df.groupby("PAIS", observed=True).sum(numeric_only=True)
 
     # Convertimos las cifras a millones de dólares.
     df["VALOR_USD"] /= 1000000
@@ -216,17 +211,11 @@ def plot_bottom(año, flujo):
         remesas enviadas o recibidas desde México.
 
     """
-    # Cargamos el archivo CSV de remesas por país.
-    df = pd.read_csv("./data/remesas_pais.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
-
-    # Seleccionamos solo los registros del tipo de flujo indicado.
-    df = df[df["FLUJO"] == flujo]
+    # Consultamos las remesas por país del año y tipo de flujo indicados.
+    df = consultar("remesas_pais_anual", año, año, FLUJO=flujo)
 
     # Calculamos el total por país.
-    df = df.groupby("PAIS").sum(numeric_only=True)
+    df = df.groupby("PAIS", observed=True).sum(numeric_only=True)
 
     # Creamos el texto que irá en cada barra.
     df["text"] = df.apply(lambda x: f" {x['VALOR_USD']:,.0f} ", axis=1)
@@ -381,17 +370,11 @@ def plot_map(año, flujo):
 
     """
 
-    # Cargamos el archivo CSV de remesas por país.
-    df = pd.read_csv("./data/remesas_pais.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos los reigstros del año especificado.
-    df = df[df["PERIODO"].dt.year == año]
-
-    # Seleccionamos solo los registros del tipo de flujo indicado.
-    df = df[df["FLUJO"] == flujo]
+    # Consultamos las remesas por país del año y tipo de flujo indicados.
+    df = consultar("remesas_pais_anual", año, año, FLUJO=flujo)
 
     # Calculamos el total por país.
-    df = df.groupby("ID_PAIS").sum(numeric_only=True)
+    df = df.groupby("ID_PAIS", observed=True).sum(numeric_only=True)
 
     # Quitamos valores en cero.
     df = df[df["VALOR_USD"] != 0]
@@ -539,16 +522,8 @@ def plot_tendencias(primer_año, ultimo_año, flujo):
 
     """
 
-    # Cargamos el dataset de remesas por país.
-    df = pd.read_csv("./data/remesas_pais.csv", parse_dates=["PERIODO"])
-
-    # Seleccionamos solo los registros del tipo de flujo indicado.
-    df = df[df["FLUJO"] == flujo]
-
-    # Seleccionamos los años dentro de nuestro rango de interés.
-    df = df[
-        (df["PERIODO"].dt.year >= primer_año) & (df["PERIODO"].dt.year <= ultimo_año)
-    ]
+    # Consultamos las remesas por país del rango de años y tipo de flujo indicados.
+    df = consultar("remesas_pais_anual", primer_año, ultimo_año, FLUJO=flujo)
 
     # Transformamos nuestro dataset para que el índice sean los países y las columnas los años.
     df = df.pivot_table(
@@ -556,6 +531,7 @@ def plot_tendencias(primer_año, ultimo_año, flujo):
         columns=df["PERIODO"].dt.year,
         values="VALOR_USD",
         aggfunc="sum",
+        observed=True,
     )
 
     # Convertimos las cifras a millones de dólares.
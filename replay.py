@@ -0,0 +1,341 @@
+"""
+Este script permite ejecutar y medir el ETL sin conexión a Banxico.
+
+Tiene cuatro modos:
+
+    python replay.py grabar ./fixtures
+        Descarga todos los cuadros del SIE y los guarda como '{ID}.xls'.
+
+    python replay.py servir ./fixtures --puerto 8000
+        Levanta un servidor HTTP local que responde como el SIE usando
+        los archivos grabados. Se puede usar con 'etl.py --replay URL'.
+        Con --retraso y --fallas el servidor agrega esperas y responde
+        con errores 503 para probar los reintentos de las descargas.
+
+    python replay.py benchmark ./fixtures --repeticiones 3
+        Ejecuta todas las etapas del ETL contra los archivos grabados en
+        una carpeta temporal y muestra el tiempo de descarga, lectura,
+        transformación y escritura de cada tabla.
+
+    python replay.py verificar ./fixtures
+        Ejecuta el ETL dos veces contra los archivos grabados y termina
+        con un error si la segunda ejecución registra revisiones, es
+        decir, si el historial de cambios reporta revisiones falsas.
+"""
+
+import argparse
+import glob
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import etl
+import instrumentacion
+from cambios import CARPETA_CAMBIOS
+from descargas import descargar_cuadros, redirigir_urls
+
+
+def crear_servidor(carpeta, puerto=0, retraso=0, fallas=0):
+    """
+    Crea un servidor HTTP que responde con los archivos grabados del SIE.
+
+    El cuadro solicitado se obtiene del parámetro 'idCuadro' de la URL.
+    El servidor mantiene las conexiones abiertas (HTTP/1.1).
+
+    Parameters
+    ----------
+    carpeta : str
+        La carpeta con un archivo '{ID del cuadro}.xls' por cada cuadro.
+
+    puerto : int
+        El puerto del servidor. Si es 0 se escoge uno libre.
+
+    retraso : float
+        Segundos que espera el servidor antes de responder cada solicitud.
+
+    fallas : float
+        Proporción de solicitudes (entre 0 y 1) que se responden con un error 503.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        El servidor, aún sin iniciar.
+
+    """
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(retraso)
+
+            if random.random() < fallas:
+                self.send_error(503, "Falla simulada")
+                return
+
+            cuadro = parse_qs(urlparse(self.path).query).get("idCuadro", [""])[0]
+            ruta = os.path.join(carpeta, f"{cuadro}.xls")
+
+            if not os.path.exists(ruta):
+                self.send_error(404, f"Cuadro no grabado: {cuadro}")
+                return
+
+            with open(ruta, "rb") as archivo:
+                contenido = archivo.read()
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.ms-excel")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+
+
+def grabar(carpeta):
+    """
+    Descarga todos los cuadros del SIE y los guarda en una carpeta.
+
+    Parameters
+    ----------
+    carpeta : str
+        La carpeta donde se guardarán los archivos.
+
+    """
+
+    archivos = descargar_cuadros(etl.construir_urls(), ttl=0)
+
+    os.makedirs(carpeta, exist_ok=True)
+
+    for cuadro, contenido in archivos.items():
+        with open(os.path.join(carpeta, f"{cuadro}.xls"), "wb") as archivo:
+            archivo.write(contenido)
+
+
+@contextmanager
+def entorno_temporal(carpeta, copiar_datos=False):
+    """
+    Prepara una carpeta temporal para ejecutar el ETL con archivos grabados.
+
+    Los archivos se sirven desde un servidor HTTP local para incluir
+    el tiempo de descarga. Todas las salidas se escriben en la carpeta
+    temporal, por lo que los datos del repositorio no se modifican.
+
+    Parameters
+    ----------
+    carpeta : str
+        La carpeta con un archivo '{ID del cuadro}.xls' por cada cuadro.
+
+    copiar_datos : bool
+        Si es True se copian los CSV de data/ (sin las versiones Parquet
+        ni la base de datos), como en un clon nuevo del repositorio.
+        Si es False, data/ inicia vacía.
+
+    Yields
+    ------
+    dict
+        Las URLs de los cuadros redirigidas al servidor local.
+
+    """
+
+    carpeta = os.path.abspath(carpeta)
+    directorio_original = os.getcwd()
+
+    servidor = crear_servidor(carpeta)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as temporal:
+        # El ETL necesita el catálogo de municipios.
+        shutil.copytree(
+            os.path.join(directorio_original, "assets"),
+            f"{temporal}/assets",
+            ignore=shutil.ignore_patterns("*.parquet", "pib"),
+        )
+
+        if copiar_datos:
+            shutil.copytree(
+                os.path.join(directorio_original, "data"),
+                f"{temporal}/data",
+                ignore=shutil.ignore_patterns("*.parquet", "*.sqlite"),
+            )
+        else:
+            os.makedirs(f"{temporal}/data")
+
+        os.chdir(temporal)
+
+        try:
+            yield redirigir_urls(
+                etl.construir_urls(), f"http://127.0.0.1:{servidor.server_port}"
+            )
+        finally:
+            os.chdir(directorio_original)
+            servidor.shutdown()
+
+
+def ejecutar_etapas(urls):
+    """
+    Descarga los cuadros y ejecuta todas las etapas del ETL una por una.
+
+    Parameters
+    ----------
+    urls : dict
+        Las URLs de los cuadros.
+
+    """
+
+    archivos = descargar_cuadros(urls, ttl=0)
+
+    # Las etapas se ejecutan una por una para medirlas por separado.
+    for nombre, definicion in etl.ETAPAS.items():
+        with instrumentacion.etapa(nombre):
+            definicion["funcion"](archivos)
+
+
+def benchmark(carpeta, repeticiones=1):
+    """
+    Mide el tiempo de cada fase del ETL usando archivos grabados.
+
+    Parameters
+    ----------
+    carpeta : str
+        La carpeta con un archivo '{ID del cuadro}.xls' por cada cuadro.
+
+    repeticiones : int
+        El número de veces que se ejecuta el ETL completo.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El promedio por etapa de cada métrica de instrumentacion.resumen().
+
+    """
+
+    # Las descargas se registran por cuadro, las asignamos a su etapa.
+    etapas = {
+        cuadro: nombre
+        for nombre, definicion in etl.ETAPAS.items()
+        for cuadro in definicion["cuadros"]
+    }
+
+    with entorno_temporal(carpeta) as urls:
+        for _ in range(repeticiones):
+            # Cada repetición inicia sin caché ni datos, de lo contrario los
+            # cuadros se recuperarían de los puntos de control y no se medirían.
+            for salida in ["./cache", "./data"]:
+                shutil.rmtree(salida, ignore_errors=True)
+
+            os.makedirs("./data")
+            ejecutar_etapas(urls)
+
+    df = instrumentacion.resumen(cuadros=etapas) / repeticiones
+    df.loc["Total"] = df.sum(axis=0, min_count=1)
+
+    return df
+
+
+def contar_revisiones():
+    """
+    Cuenta los registros revisados en el historial de cambios de cada tabla.
+
+    Returns
+    -------
+    pandas.Series
+        El número de registros revisados por tabla.
+
+    """
+
+    conteo = dict()
+
+    for ruta in sorted(glob.glob(os.path.join(CARPETA_CAMBIOS, "*.csv"))):
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        cambios = pd.read_csv(ruta, usecols=["CAMBIO"])
+        conteo[nombre] = (cambios["CAMBIO"] == "revisado").sum()
+
+    return pd.Series(conteo, dtype=int)
+
+
+def verificar(carpeta):
+    """
+    Verifica que volver a ejecutar el ETL sin cambios en los cuadros
+    no registre revisiones.
+
+    El ETL se ejecuta dos veces sobre una copia de data/ y assets/ sin
+    las versiones Parquet, como en un clon nuevo del repositorio, por lo
+    que la versión anterior de cada tabla se lee de su CSV. La primera
+    ejecución registra las diferencias reales entre los archivos grabados
+    y los datos del repositorio; la segunda no debe registrar ninguna.
+
+    Parameters
+    ----------
+    carpeta : str
+        La carpeta con un archivo '{ID del cuadro}.xls' por cada cuadro.
+
+    Returns
+    -------
+    pandas.DataFrame
+        El número de registros revisados por tabla en cada ejecución.
+
+    """
+
+    with entorno_temporal(carpeta, copiar_datos=True) as urls:
+        ejecutar_etapas(urls)
+        primera = contar_revisiones()
+
+        # Sin las versiones Parquet, la versión anterior se lee del CSV.
+        for ruta in glob.glob("./data/*.parquet") + glob.glob("./assets/*.parquet"):
+            os.remove(ruta)
+
+        ejecutar_etapas(urls)
+        segunda = contar_revisiones().sub(primera, fill_value=0)
+
+    return pd.DataFrame({"primera": primera, "segunda": segunda}).fillna(0).astype(int)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("modo", choices=["grabar", "servir", "benchmark", "verificar"])
+    parser.add_argument("carpeta", help="Carpeta con los archivos grabados.")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument(
+        "--retraso", type=float, default=0, help="Segundos de espera por solicitud."
+    )
+    parser.add_argument(
+        "--fallas",
+        type=float,
+        default=0,
+        help="Proporción de solicitudes que se responden con un error 503.",
+    )
+    args = parser.parse_args()
+
+    if args.modo == "grabar":
+        grabar(args.carpeta)
+    elif args.modo == "servir":
+        print(f"Sirviendo {args.carpeta} en http://127.0.0.1:{args.puerto}")
+        crear_servidor(
+            args.carpeta, args.puerto, args.retraso, args.fallas
+        ).serve_forever()
+    elif args.modo == "benchmark":
+        resultado = benchmark(args.carpeta, args.repeticiones)
+        instrumentacion.imprimir_tabla(resultado, sys.stdout)
+    elif args.modo == "verificar":
+        resultado = verificar(args.carpeta)
+        print(resultado.to_string())
+
+        # La segunda ejecución no debe encontrar revisiones.
+        if resultado["segunda"].sum():
+            sys.exit(1)
@@ -0,0 +1,319 @@
+"""
+Este módulo simplifica los polígonos de un GeoJSON sin abrir huecos
+entre las geometrías vecinas.
+
+Dos entidades o municipios vecinos comparten su frontera, pero cada uno
+la guarda en su propio polígono. Si cada polígono se simplificara por
+separado, la frontera quedaría distinta en cada lado y aparecerían
+huecos o traslapes. Para evitarlo, la simplificación se hace por arcos,
+como en TopoJSON:
+
+    1. Se buscan las uniones: los vértices donde se juntan tres o más
+       geometrías o donde dos geometrías dejan de compartir la frontera.
+    2. Cada anillo se divide en arcos que van de una unión a la siguiente.
+       Un arco compartido aparece una vez en cada geometría (en sentidos
+       opuestos), pero se simplifica una sola vez con Douglas-Peucker.
+    3. Los anillos se vuelven a armar con los arcos simplificados, por lo
+       que ambos lados de cada frontera conservan los mismos vértices.
+
+Las uniones nunca se eliminan. Los anillos que quedarían con menos de
+tres vértices (islas más pequeñas que la tolerancia) se conservan sin
+simplificar para que ninguna geometría desaparezca del mapa.
+"""
+
+import numpy as np
+
+
+def obtener_poligonos(geometria):
+    """
+    Regresa la lista de polígonos de una geometría.
+
+    Parameters
+    ----------
+    geometria : dict
+        Una geometría Polygon o MultiPolygon de GeoJSON.
+
+    Returns
+    -------
+    list
+        Los polígonos, cada uno como una lista de anillos.
+
+    """
+
+    if geometria["type"] == "Polygon":
+        return [geometria["coordinates"]]
+
+    if geometria["type"] == "MultiPolygon":
+        return geometria["coordinates"]
+
+    raise ValueError(f"Tipo de geometría no soportado: {geometria['type']}")
+
+
+def limpiar_anillo(anillo):
+    """
+    Convierte un anillo a tuplas y quita los vértices repetidos consecutivos.
+
+    Parameters
+    ----------
+    anillo : list
+        Las coordenadas del anillo.
+
+    Returns
+    -------
+    list
+        Las coordenadas como tuplas, con el primer vértice repetido al final.
+
+    """
+
+    puntos = list()
+
+    for punto in anillo:
+        punto = tuple(punto[:2])
+
+        if not puntos or punto != puntos[-1]:
+            puntos.append(punto)
+
+    if puntos[0] != puntos[-1]:
+        puntos.append(puntos[0])
+
+    return puntos
+
+
+def encontrar_uniones(anillos):
+    """
+    Encuentra los vértices donde inicia o termina una frontera compartida.
+
+    Un vértice es una unión si tiene más de dos vecinos distintos
+    sumando todos los anillos que pasan por él.
+
+    Parameters
+    ----------
+    anillos : list
+        Los anillos de todas las geometrías, generados por limpiar_anillo().
+
+    Returns
+    -------
+    set
+        Las coordenadas de las uniones.
+
+    """
+
+    vecinos = dict()
+
+    for anillo in anillos:
+        for anterior, punto, siguiente in zip(
+            [anillo[-2]] + anillo[:-2], anillo[:-1], anillo[1:]
+        ):
+            vecinos.setdefault(punto, set()).update((anterior, siguiente))
+
+    return {punto for punto, conjunto in vecinos.items() if len(conjunto) > 2}
+
+
+def dividir_anillo(anillo, uniones):
+    """
+    Divide un anillo en arcos que van de una unión a la siguiente.
+
+    Parameters
+    ----------
+    anillo : list
+        Las coordenadas del anillo, generadas por limpiar_anillo().
+
+    uniones : set
+        Las uniones encontradas por encontrar_uniones().
+
+    Returns
+    -------
+    list
+        Los arcos. El último vértice de cada arco es el primero del siguiente.
+
+    """
+
+    puntos = anillo[:-1]
+    posiciones = [i for i, punto in enumerate(puntos) if punto in uniones]
+
+    # Un anillo sin uniones es un solo arco. Lo iniciamos en su vértice
+    # menor para que dos anillos idénticos generen el mismo arco.
+    if not posiciones:
+        inicio = puntos.index(min(puntos))
+        puntos = puntos[inicio:] + puntos[:inicio]
+        return [puntos + [puntos[0]]]
+
+    puntos = puntos[posiciones[0] :] + puntos[: posiciones[0]]
+    posiciones = [posicion - posiciones[0] for posicion in posiciones]
+    puntos.append(puntos[0])
+
+    return [
+        puntos[inicio : fin + 1]
+        for inicio, fin in zip(posiciones, posiciones[1:] + [len(puntos) - 1])
+    ]
+
+
+def douglas_peucker(puntos, tolerancia):
+    """
+    Escoge los vértices que se conservan de una línea con Douglas-Peucker.
+
+    Parameters
+    ----------
+    puntos : numpy.ndarray
+        Arreglo con forma (n, 2) con las coordenadas de la línea.
+
+    tolerancia : float
+        La distancia máxima, en grados, entre la línea original
+        y la simplificada.
+
+    Returns
+    -------
+    numpy.ndarray
+        Arreglo booleano con True en los vértices que se conservan.
+        El primer y el último vértice siempre se conservan.
+
+    """
+
+    conservar = np.zeros(len(puntos), dtype=bool)
+    conservar[[0, -1]] = True
+
+    pendientes = [(0, len(puntos) - 1)]
+
+    while pendientes:
+        inicio, fin = pendientes.pop()
+
+        if fin - inicio < 2:
+            continue
+
+        a = puntos[inicio]
+        dx, dy = puntos[fin] - a
+        tramo = puntos[inicio + 1 : fin] - a
+        longitud = np.hypot(dx, dy)
+
+        # Los arcos cerrados inician y terminan en el mismo vértice,
+        # en ese caso se usa la distancia a ese vértice.
+        if longitud == 0:
+            distancias = np.hypot(tramo[:, 0], tramo[:, 1])
+        else:
+            distancias = np.abs(dx * tramo[:, 1] - dy * tramo[:, 0]) / longitud
+
+        mayor = int(np.argmax(distancias))
+
+        if distancias[mayor] > tolerancia:
+            medio = inicio + 1 + mayor
+            conservar[medio] = True
+            pendientes.extend([(inicio, medio), (medio, fin)])
+
+    return conservar
+
+
+def simplificar_arco(arco, arcos, tolerancia, decimales):
+    """
+    Simplifica un arco o recupera su versión ya simplificada.
+
+    La llave de cada arco es el arco en el sentido que sea menor, así
+    las dos geometrías que comparten una frontera usan los mismos vértices.
+
+    Parameters
+    ----------
+    arco : list
+        Las coordenadas del arco, generado por dividir_anillo().
+
+    arcos : dict
+        Los arcos ya simplificados. Se actualiza con el nuevo arco.
+
+    tolerancia : float
+        La distancia máxima, en grados, entre el arco original y el simplificado.
+
+    decimales : int
+        El número de decimales de las coordenadas simplificadas.
+
+    Returns
+    -------
+    list
+        Las coordenadas simplificadas, en el mismo sentido que el arco.
+
+    """
+
+    llave = min(tuple(arco), tuple(reversed(arco)))
+
+    if llave not in arcos:
+        puntos = np.round(np.array(llave), decimales)
+        arcos[llave] = puntos[douglas_peucker(puntos, tolerancia)].tolist()
+
+    if tuple(arco) == llave:
+        return arcos[llave]
+
+    return arcos[llave][::-1]
+
+
+def simplificar_geojson(geojson, tolerancia, decimales=5):
+    """
+    Simplifica todos los polígonos de un GeoJSON conservando las
+    fronteras compartidas.
+
+    Parameters
+    ----------
+    geojson : dict
+        Un GeoJSON (FeatureCollection) con geometrías Polygon o MultiPolygon.
+
+    tolerancia : float
+        La distancia máxima, en grados, entre las fronteras originales
+        y las simplificadas.
+
+    decimales : int
+        El número de decimales de las coordenadas simplificadas.
+
+    Returns
+    -------
+    dict
+        Un nuevo GeoJSON con las mismas propiedades y las geometrías
+        simplificadas. El GeoJSON original no se modifica.
+
+    """
+
+    geometrias = [
+        [
+            [limpiar_anillo(anillo) for anillo in poligono]
+            for poligono in obtener_poligonos(geometria["geometry"])
+        ]
+        for geometria in geojson["features"]
+    ]
+
+    uniones = encontrar_uniones(
+        [
+            anillo
+            for poligonos in geometrias
+            for poligono in poligonos
+            for anillo in poligono
+        ]
+    )
+
+    # Arcos ya simplificados, compartidos por todas las geometrías.
+    arcos = dict()
+
+    features = list()
+
+    for original, poligonos in zip(geojson["features"], geometrias):
+        coordenadas = list()
+
+        for poligono in poligonos:
+            anillos = list()
+
+            for anillo in poligono:
+                simplificado = list()
+
+                for arco in dividir_anillo(anillo, uniones):
+                    puntos = simplificar_arco(arco, arcos, tolerancia, decimales)
+                    simplificado.extend(puntos[1:] if simplificado else puntos)
+
+                if len(simplificado) < 4:
+                    simplificado = np.round(np.array(anillo), decimales).tolist()
+
+                anillos.append(simplificado)
+
+            coordenadas.append(anillos)
+
+        if original["geometry"]["type"] == "Polygon":
+            geometria = {"type": "Polygon", "coordinates": coordenadas[0]}
+        else:
+            geometria = {"type": "MultiPolygon", "coordinates": coordenadas}
+
+        features.append({**original, "geometry": geometria})
+
+    return {**geojson, "features": features}
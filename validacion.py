@@ -0,0 +1,258 @@
+"""
+Este módulo valida cada conjunto de datos antes de que el ETL lo guarde.
+
+Las revisiones se hacen con operaciones vectorizadas sobre todo el
+DataFrame y se basan en el esquema de cada conjunto de datos:
+
+    - Valores nulos en cualquier columna.
+    - Códigos y nombres que no existen en su catálogo.
+    - Llaves duplicadas.
+    - Códigos compartidos por más de un nombre.
+    - Periodos que no corresponden al inicio de un mes, trimestre o año.
+    - Periodos faltantes dentro de cada serie.
+    - Series que terminan antes del último periodo disponible.
+    - Valores fuera de su rango permitido.
+
+Si alguna revisión falla, se lanza un error con el resumen de todas
+las fallas y el archivo no se escribe. Así, los scripts que crean las
+gráficas pueden confiar en que los datos cumplen con estas reglas.
+"""
+
+import pandas as pd
+
+from esquemas import ESQUEMAS
+
+
+# Número máximo de ejemplos que se muestran por cada falla.
+MAX_EJEMPLOS = 5
+
+# Número de meses entre cada periodo según la frecuencia del esquema.
+MESES_POR_PERIODO = {"MS": 1, "QS": 3, "YS": 12}
+
+
+def ejemplos(df):
+    """
+    Regresa algunos registros de un DataFrame como texto.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame | pandas.Series
+        Los registros que fallaron una revisión.
+
+    Returns
+    -------
+    str
+        Los primeros registros separados por punto y coma.
+
+    """
+
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    registros = df.head(MAX_EJEMPLOS).astype(str).to_dict("records")
+
+    return "; ".join(", ".join(f"{k}={v}" for k, v in r.items()) for r in registros)
+
+
+def revisar_nulos(df, esquema):
+    """
+    Revisa que ninguna columna tenga valores nulos.
+    """
+
+    nulos = df[list(esquema["columnas"])].isna().sum()
+
+    return [
+        f"{columna}: {total:,} valores nulos"
+        for columna, total in nulos[nulos > 0].items()
+    ]
+
+
+def revisar_catalogos(df, esquema):
+    """
+    Revisa que los valores de las columnas categóricas con
+    categorías fijas existan en su catálogo.
+    """
+
+    fallas = list()
+
+    for columna, tipo in esquema["columnas"].items():
+        if not isinstance(tipo, pd.CategoricalDtype) or tipo.categories is None:
+            continue
+
+        valores = df[columna].dropna()
+        faltantes = valores[~valores.isin(tipo.categories)].unique()
+
+        if len(faltantes):
+            fallas.append(
+                f"{columna}: {len(faltantes):,} valores fuera del catálogo, "
+                f"por ejemplo {list(faltantes[:MAX_EJEMPLOS])}"
+            )
+
+    return fallas
+
+
+def revisar_llaves(df, esquema):
+    """
+    Revisa que no haya registros con las mismas llaves.
+    """
+
+    llaves = esquema["llaves"]
+    duplicados = df[df.duplicated(llaves, keep=False)]
+
+    if duplicados.empty:
+        return list()
+
+    return [
+        f"llaves duplicadas ({', '.join(llaves)}): {len(duplicados):,} registros, "
+        f"por ejemplo {ejemplos(duplicados[llaves])}"
+    ]
+
+
+def revisar_nombres(df, esquema):
+    """
+    Revisa que cada código corresponda a un solo nombre.
+    """
+
+    fallas = list()
+
+    for codigo, nombre in esquema.get("nombres", dict()).items():
+        pares = df[[codigo, nombre]].drop_duplicates()
+        repetidos = pares[pares.duplicated(codigo, keep=False)]
+
+        if len(repetidos):
+            fallas.append(f"{codigo} con más de un {nombre}: {ejemplos(repetidos)}")
+
+    return fallas
+
+
+def revisar_periodos(df, esquema):
+    """
+    Revisa que los periodos estén alineados, que cada serie no tenga
+    periodos faltantes y que todas las series lleguen al último periodo.
+    """
+
+    fallas = list()
+
+    paso = MESES_POR_PERIODO[esquema["frecuencia"]]
+    periodos = df["PERIODO"]
+
+    # Cada periodo debe ser el primer día de un mes, trimestre o año.
+    desalineados = periodos[
+        (periodos.dt.day != 1) | ((periodos.dt.month - 1) % paso != 0)
+    ]
+
+    if len(desalineados):
+        fallas.append(
+            f"{len(desalineados):,} periodos mal alineados para la frecuencia "
+            f"{esquema['frecuencia']}, por ejemplo {ejemplos(desalineados)}"
+        )
+
+    series = [llave for llave in esquema["llaves"] if llave != "PERIODO"]
+
+    # Sin series, comparamos contra todos los periodos entre el primero y el último.
+    if not series:
+        todos = pd.date_range(
+            periodos.min(), periodos.max(), freq=esquema["frecuencia"]
+        )
+        faltantes = todos.difference(periodos)
+
+        if len(faltantes):
+            fallas.append(
+                f"{len(faltantes):,} periodos faltantes, por ejemplo "
+                f"{list(faltantes.strftime('%Y-%m-%d')[:MAX_EJEMPLOS])}"
+            )
+
+        return fallas
+
+    # Numeramos los meses para poder contar los periodos de cada serie.
+    meses = periodos.dt.year * 12 + periodos.dt.month
+    cobertura = meses.groupby([df[llave] for llave in series], observed=True).agg(
+        ["min", "max", "nunique"]
+    )
+
+    esperados = (cobertura["max"] - cobertura["min"]) // paso + 1
+    incompletas = cobertura["nunique"] < esperados
+
+    if incompletas.any():
+        faltantes = (esperados - cobertura["nunique"])[incompletas].sum()
+        fallas.append(
+            f"{faltantes:,} periodos faltantes en {incompletas.sum():,} series, "
+            f"por ejemplo {ejemplos(cobertura[incompletas].index.to_frame())}"
+        )
+
+    # Ninguna serie debe terminar antes que las demás.
+    truncadas = cobertura["max"] < cobertura["max"].max()
+
+    if truncadas.any():
+        fallas.append(
+            f"{truncadas.sum():,} series terminan antes del último periodo, "
+            f"por ejemplo {ejemplos(cobertura[truncadas].index.to_frame())}"
+        )
+
+    return fallas
+
+
+def revisar_rangos(df, esquema):
+    """
+    Revisa que los valores numéricos estén dentro de su rango permitido.
+    """
+
+    fallas = list()
+
+    for columna, (minimo, maximo) in esquema.get("rangos", dict()).items():
+        fuera = pd.Series(False, index=df.index)
+
+        if minimo is not None:
+            fuera |= df[columna] < minimo
+
+        if maximo is not None:
+            fuera |= df[columna] > maximo
+
+        if fuera.any():
+            fallas.append(
+                f"{columna}: {fuera.sum():,} valores fuera del rango "
+                f"[{minimo}, {maximo}], por ejemplo "
+                f"{ejemplos(df.loc[fuera, ['PERIODO', columna]])}"
+            )
+
+    return fallas
+
+
+REVISIONES = [
+    revisar_nulos,
+    revisar_catalogos,
+    revisar_llaves,
+    revisar_nombres,
+    revisar_periodos,
+    revisar_rangos,
+]
+
+
+def validar(df, nombre):
+    """
+    Ejecuta todas las revisiones sobre un conjunto de datos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        El conjunto de datos con todas las columnas de su esquema.
+
+    nombre : str
+        El nombre del conjunto de datos en ESQUEMAS.
+
+    Raises
+    ------
+    ValueError
+        Si alguna revisión falla. El mensaje incluye todas las fallas.
+
+    """
+
+    esquema = ESQUEMAS[nombre]
+
+    fallas = [falla for revision in REVISIONES for falla in revision(df, esquema)]
+
+    if fallas:
+        detalle = "\n".join(f"  - {falla}" for falla in fallas)
+        raise ValueError(
+            f"El conjunto de datos {nombre} no pasó la validación:\n{detalle}"
+        )